@@ -48,9 +48,20 @@ class Settings:
     def DATABASE_URL(self, value: str) -> None:
         self._database_url = value
 
+    # Connection pool sizing (ignored for SQLite)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
     # File upload settings
     UPLOAD_FOLDER: Path = Path(os.getenv("UPLOAD_FOLDER", "uploads")).resolve()
 
+    # JPEGs larger than this many bytes are downscaled to A4 at 300 DPI
+    # before conversion; off (0) by default since it re-encodes the upload
+    JPEG_DOWNSCALE_THRESHOLD: int = int(
+        os.getenv("JPEG_DOWNSCALE_THRESHOLD", "0")
+    )
+
     # Production Celery settings (will be patched for tests)
     CELERY_BROKER_URL: str = os.getenv(
         "CELERY_BROKER_URL", "redis://redis:6379/0"
@@ -58,6 +69,11 @@ class Settings:
     CELERY_RESULT_BACKEND: str = os.getenv(
         "CELERY_RESULT_BACKEND", "redis://redis:6379/0"
     )
+    # Route conversions and merges to the "convert" and "merge" queues;
+    # every worker must then be started with -Q for the queue it serves
+    CELERY_DEDICATED_QUEUES: bool = os.getenv(
+        "CELERY_DEDICATED_QUEUES", "False"
+    ).lower() in ("true", "1", "t")
 
     # Security
     SECRET_KEY: str = os.getenv(
@@ -1,14 +1,17 @@
 """PDF generation functionality."""
 
 import io
+import logging
 from pathlib import Path
 from typing import BinaryIO, List, Union
 
 from PIL import Image
-from pypdf import PdfReader, PdfWriter
+from pypdf import PdfWriter
 
 import img2pdf
 
+logger = logging.getLogger(__name__)
+
 
 class PDFGenerator:
     """Handles PDF generation and manipulation operations."""
@@ -77,44 +80,36 @@ class PDFGenerator:
             ValueError: If no PDF files are provided to merge
             FileNotFoundError: If any input PDF file does not exist
         """
-        print("\n=== INSIDE merge_pdfs ===")
-        print(f"pdf_paths: {pdf_paths}")
-        print(f"output_path: {output_path}")
-
         if not pdf_paths:
             raise ValueError("No PDF files to merge")
 
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Merging %d PDFs into %s: %s",
+                len(pdf_paths),
+                output_path,
+                ", ".join(map(str, pdf_paths)),
+            )
+
         # Ensure all input files exist before starting
         for pdf_path in pdf_paths:
-            print(f"Checking if {pdf_path} exists")
             if not pdf_path.exists():
-                print(f"File not found: {pdf_path}")
                 raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
-        print("Creating PdfWriter instance")
         writer = PdfWriter()
-        print(f"PdfWriter instance created: {writer}")
 
         try:
-            for i, pdf_path in enumerate(pdf_paths, 1):
-                print(f"Processing PDF {i}/{len(pdf_paths)}: {pdf_path}")
-                reader = PdfReader(str(pdf_path))
-                print(f"  PDF has {len(reader.pages)} pages")
-
-                # Add all pages from this PDF to the writer
-                for page in reader.pages:
-                    writer.add_page(page)
-                print(f"  Successfully added pages from: {pdf_path}")
-
-            # Ensure output directory exists
-            print(f"Ensuring output directory exists: {output_path.parent}")
+            for pdf_path in pdf_paths:
+                # Only the pages are needed; skip rebuilding the source's
+                # outline (bookmark) tree
+                writer.append(str(pdf_path), import_outline=False)
+
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Write merged PDF to output path
-            print(f"Writing merged PDF to: {output_path}")
             with open(str(output_path), "wb") as output_file:
                 writer.write(output_file)
-            print("Successfully wrote merged PDF")
+            logger.debug("Wrote merged PDF to %s", output_path)
             return output_path
         finally:
             writer.close()
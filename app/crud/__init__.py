@@ -1,9 +1,19 @@
 from app.crud.base import CRUDBase
 from app.crud.crud_file import CRUDFile, file
-from app.crud.crud_user import CRUDUser, authenticate_user, user
+from app.crud.crud_user import (
+    CRUDUser,
+    authenticate_user,
+    create_user,
+    get_user_by_email,
+    get_user_by_username,
+    user,
+)
 
 __all__ = [
     "authenticate_user",
+    "create_user",
+    "get_user_by_email",
+    "get_user_by_username",
     "user",
     "file",
     "CRUDBase",
@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import Optional, Sequence
 
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
@@ -14,6 +15,16 @@ class CRUDFile(CRUDBase[FileModel, FileCreate, FileUpdate]):
         """Get a file by ID"""
         return db.query(self.model).filter(self.model.id == id).first()
 
+    def get_paths_by_ids(
+        self, db: Session, *, ids: Sequence[int]
+    ) -> list[Row]:
+        """Get (id, filepath, owner_id) rows for the given IDs (unordered)"""
+        return (
+            db.query(self.model.id, self.model.filepath, self.model.owner_id)
+            .filter(self.model.id.in_(ids))
+            .all()
+        )
+
     def get_multi_by_owner(
         self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
     ) -> list[FileModel]:
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -8,11 +8,29 @@ _engine = None
 _SessionLocal = None
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL with relaxed syncing so commits don't each wait on fsync."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 def get_engine():
     """Get or create the SQLAlchemy engine."""
     global _engine
     if _engine is None:
-        _engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+        is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+        engine_kwargs = {"pool_pre_ping": True}
+        if not is_sqlite:
+            engine_kwargs.update(
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+            )
+        _engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
+        if is_sqlite:
+            event.listen(_engine, "connect", _set_sqlite_pragmas)
     return _engine
 
 
@@ -4,11 +4,11 @@ from app.interfaces.task_service_interface import TaskServiceInterface
 from app.services.pdf_service import PDFService
 from app.services.task_service import TaskService
 
-# Initialize task service
+# The two services depend on each other: build the task service first,
+# hand it to the PDF service, then bind the PDF service back to it
 task_service = TaskService()
-
-# Initialize PDF service with task service dependency
 pdf_service = PDFService(task_service=task_service)
+task_service.pdf_service = pdf_service
 
 __all__ = [
     "task_service",
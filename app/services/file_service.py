@@ -238,11 +238,16 @@ class FileService:
                 # This will raise appropriate HTTP exceptions if access is denied
                 self.get_file_by_id(db, file_id, current_user)
 
+        result = task_result.result if task_result.ready() else None
+        if isinstance(result, Exception):
+            # Failed tasks store the raised exception; expose its message
+            result = {"status": "error", "error": str(result)}
+
         logger.info("Task %s status: %s", task_id, task_result.status)
         return {
             "task_id": task_id,
             "status": task_result.status,
-            "result": task_result.result if task_result.ready() else None,
+            "result": result,
         }
 
     def start_image_conversion(
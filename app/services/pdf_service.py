@@ -5,26 +5,38 @@ This module contains the business logic for PDF operations,
 separated from the Celery task definitions.
 """
 
+import io
 import logging
 import os
-from typing import List
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import BinaryIO, List, Union
 
 from fastapi import HTTPException, status
-from pypdf import PdfWriter
+from PIL import Image
+from sqlalchemy import Row, insert
 from sqlalchemy.orm import Session
 
-import img2pdf
+import pikepdf
 from app import crud
 from app.core.config import settings
 from app.interfaces.task_service_interface import TaskServiceInterface
 from app.models.file import File
-from app.models.file import File as FileModel
 from app.models.user import User
 from app.schemas.file import FileCreate
 from app.schemas.pdf import MergePdfsRequest, MergeTaskResponse
 
 logger = logging.getLogger(__name__)
 
+# A4 at 300 DPI, long side first
+JPEG_MAX_SIZE = (3508, 2480)
+JPEG_CONTENT_TYPES = ("image/jpeg", "image/jpg")
+# Upper bound on concurrent input opens per merge
+MERGE_OPEN_WORKERS = 8
+# Write buffer for merged output; qpdf emits many small writes
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
 
 class PDFService:
     """Service for handling PDF-related operations."""
@@ -37,7 +49,7 @@ class PDFService:
 
     def convert_image_to_pdf(
         self, db: Session, file_id: int, owner_id: int
-    ) -> File:
+    ) -> Row:
         """
         Convert an image file to PDF.
 
@@ -47,68 +59,156 @@ class PDFService:
             owner_id: ID of the user who owns the file
 
         Returns:
-            File: The newly created PDF file record
+            Row: The ``id`` and ``filepath`` of the new PDF file record
 
         Raises:
             ValueError: If the file is not found or not an image
         """
+        # Imported here so the API and merge-only workers never load it
+        import img2pdf
+
         logger.info("Converting image to PDF for file id %s", file_id)
 
         image_file = db.query(File).filter(File.id == file_id).first()
         if not image_file:
             raise ValueError(f"File with id {file_id} not found.")
 
-        # Read image and convert to PDF
+        # Create output filename and path
+        pdf_filename = f"{os.path.splitext(image_file.filename)[0]}.pdf"
+        output_dir = os.path.join(settings.UPLOAD_FOLDER, str(owner_id))
+        output_path = os.path.join(output_dir, pdf_filename)
+        partial_path = f"{output_path}.partial"
+
+        # Convert straight into a partial file on disk, then rename it into
+        # place, so the PDF is never held in memory or seen half-written
         try:
-            with open(image_file.filepath, "rb") as f:
+            os.makedirs(output_dir, exist_ok=True)
+            with open(image_file.filepath, "rb") as f, open(
+                partial_path, "wb"
+            ) as f_out:
                 try:
-                    pdf_bytes = img2pdf.convert([f.read()])
+                    # Hand img2pdf the open file; oversized JPEGs are
+                    # decoded from it directly, never copied whole first
+                    image_input = f
+                    if (
+                        settings.JPEG_DOWNSCALE_THRESHOLD
+                        and image_file.content_type in JPEG_CONTENT_TYPES
+                        and os.fstat(f.fileno()).st_size
+                        > settings.JPEG_DOWNSCALE_THRESHOLD
+                    ):
+                        image_input = self._downscale_jpeg(f)
+                    # img2pdf would default to pikepdf now that it is
+                    # installed; its own writer is lighter for a one-image
+                    # document and writes straight to the output stream
+                    img2pdf.convert(
+                        image_input,
+                        outputstream=f_out,
+                        engine=img2pdf.Engine.internal,
+                    )
                 except img2pdf.ImageOpenError as e:
                     raise ValueError(
                         f"Failed to convert image to PDF: {str(e)}"
                     ) from e
                 except Exception as e:
                     logger.error(
-                        f"Unexpected error during PDF conversion: {str(e)}"
+                        "Unexpected error during PDF conversion: %s", e
                     )
                     raise ValueError(
                         f"Failed to convert image to PDF: {str(e)}"
                     ) from e
 
-            # Create output filename and path
-            pdf_filename = f"{os.path.splitext(image_file.filename)[0]}.pdf"
-            output_path = settings.UPLOAD_FOLDER / str(owner_id) / pdf_filename
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Save PDF to disk
-            with open(output_path, "wb") as f_out:
-                f_out.write(pdf_bytes)
+            os.replace(partial_path, output_path)
 
             # Create file record
             file_data = FileCreate(
                 filename=pdf_filename,
-                filepath=str(output_path),
+                filepath=output_path,
                 content_type="application/pdf",
                 owner_id=owner_id,  # Set the owner_id in the file data
             )
 
-            db_file = crud.file.create(db=db, obj_in=file_data)
-            db.commit()
-            db.refresh(db_file)
-
-            return db_file
+            return self._insert_file(db, file_data)
 
         except OSError as e:
-            logger.error(f"File operation error: {str(e)}")
+            logger.error("File operation error: %s", e)
             raise ValueError(f"Failed to process file: {str(e)}") from e
 
+        finally:
+            # Drop whatever a failed conversion left behind
+            try:
+                os.remove(partial_path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _insert_file(db: Session, file_data: FileCreate) -> Row:
+        """
+        Insert a file record and commit it in a single round trip.
+
+        Only the generated primary key and the stored path come back
+        (``INSERT ... RETURNING id, filepath``); no ORM object is built or
+        loaded into the session. Callers that need the full record should
+        query it by ``id``.
+
+        Args:
+            db: Database session
+            file_data: Data for the new file record
+
+        Returns:
+            Row: The new record's ``id`` and ``filepath``
+        """
+        row = db.execute(
+            insert(File)
+            .values(**file_data.model_dump())
+            .returning(File.id, File.filepath)
+        ).one()
+        db.commit()
+        return row
+
+    @staticmethod
+    def _downscale_jpeg(image_file: BinaryIO) -> Union[BinaryIO, bytes]:
+        """
+        Shrink an oversized JPEG so it fits A4 at 300 DPI.
+
+        ``Image.draft`` makes libjpeg decode at a reduced DCT scale, so the
+        full-resolution raster is never materialized, and the encoded file
+        is streamed from ``image_file`` rather than read into memory first.
+        Images that already fit are returned untouched (rewound) to avoid a
+        lossy re-encode. The EXIF block and ICC profile are carried over, so
+        the Orientation tag still drives the page rotation and colours are
+        interpreted as before.
+        """
+        with Image.open(image_file) as im:
+            if im.width >= im.height:
+                max_size = JPEG_MAX_SIZE
+            else:
+                max_size = JPEG_MAX_SIZE[::-1]
+            if im.width <= max_size[0] and im.height <= max_size[1]:
+                image_file.seek(0)
+                return image_file
+
+            exif = im.info.get("exif", b"")
+            icc_profile = im.info.get("icc_profile")
+            im.draft("RGB", max_size)
+            im.thumbnail(max_size)
+            buf = io.BytesIO()
+            im.save(
+                buf,
+                "JPEG",
+                quality=85,
+                optimize=True,
+                exif=exif,
+                icc_profile=icc_profile,
+            )
+        return buf.getvalue()
+
     def merge_pdfs(
         self,
         db: Session,
         file_ids: List[int],
         output_filename: str,
         owner_id: int,
-    ) -> File:
+    ) -> Row:
         """
         Merge multiple PDF files into a single PDF.
 
@@ -119,7 +219,7 @@ class PDFService:
             owner_id: ID of the user who owns the files
 
         Returns:
-            File: The newly created merged PDF file record
+            Row: The ``id`` and ``filepath`` of the merged PDF file record
 
         Raises:
             ValueError: If no files provided or any file is not found or not a PDF
@@ -150,10 +250,16 @@ class PDFService:
             output_path = output_dir / f"{original_name}_{counter}.pdf"
             counter += 1
 
-        # Get all files and verify they exist and are PDFs
+        # Fetch only the columns needed, for all files in one query, and
+        # verify they exist and are PDFs; the lookup restores the requested
+        # order (and any repeated IDs)
+        found = {
+            file.id: file
+            for file in crud.file.get_paths_by_ids(db, ids=file_ids)
+        }
         files = []
         for file_id in file_ids:
-            file = crud.file.get(db, id=file_id)
+            file = found.get(file_id)
             if not file:
                 raise ValueError(f"File with ID {file_id} not found")
             if not file.filepath.lower().endswith(".pdf"):
@@ -164,52 +270,99 @@ class PDFService:
                 )
             files.append(file)
 
-        # Merge PDFs
-        merger = PdfWriter()
+        # Merge PDFs into a sibling ".partial" file and rename it into place
+        # once complete, so a crash mid-write never leaves a truncated PDF
+        # under the final name. Both live in output_dir, so the rename is an
+        # atomic same-filesystem os.replace.
+        partial_path = output_path.with_name(f"{output_path.name}.partial")
         try:
-            for file in files:
-                try:
-                    merger.append(file.filepath)
-                except Exception as e:
-                    raise ValueError(
-                        f"Error reading file {file.id}: {str(e)}"
-                    ) from e
-
-            # Write merged PDF to disk
-            with open(output_path, "wb") as output_file:
-                merger.write(output_file)
+            if len(files) == 1:
+                # Nothing to concatenate: copy the bytes as-is instead of
+                # parsing and re-serializing. On Linux shutil.copyfile uses
+                # sendfile(2), so the data never passes through Python.
+                shutil.copyfile(files[0].filepath, partial_path)
+            else:
+                # qpdf copies foreign page objects lazily, so every source
+                # must stay open until the merged document has been saved.
+                with ExitStack() as stack:
+                    merged = stack.enter_context(pikepdf.Pdf.new())
+                    for src in self._open_pdfs(files, stack):
+                        merged.pages.extend(src.pages)
+
+                    # Write merged PDF to disk; keep the input streams as
+                    # they are rather than recompressing them
+                    with open(
+                        partial_path, "wb", buffering=OUTPUT_BUFFER_SIZE
+                    ) as output_file:
+                        merged.save(
+                            output_file,
+                            linearize=False,
+                            compress_streams=False,
+                        )
+
+            os.replace(partial_path, output_path)
 
             # Create file record
-            # Create the file record directly using FileModel
-            db_file = FileModel(
+            file_data = FileCreate(
                 filename=output_path.name,
                 filepath=str(output_path),
                 content_type="application/pdf",
                 owner_id=owner_id,
             )
-            db.add(db_file)
-            db.commit()
-            db.refresh(db_file)
-
-            return db_file
+            return self._insert_file(db, file_data)
 
         except Exception as e:
             # Clean up the output file if it was created
-            if output_path.exists():
-                try:
-                    output_path.unlink()
-                except OSError:
-                    logger.warning(
-                        f"Failed to clean up output file: {output_path}"
-                    )
+            for path in (partial_path, output_path):
+                if path.exists():
+                    try:
+                        path.unlink()
+                    except OSError:
+                        logger.warning(
+                            "Failed to clean up output file: %s", path
+                        )
             raise ValueError(f"Failed to merge PDFs: {str(e)}") from e
 
-        finally:
-            # Ensure the merger is always closed
-            try:
-                merger.close()
-            except Exception as e:
-                logger.warning(f"Error closing PDF merger: {str(e)}")
+    @staticmethod
+    def _open_pdfs(files: List[Row], stack: ExitStack) -> List[pikepdf.Pdf]:
+        """
+        Open the merge inputs concurrently.
+
+        Opening and parsing the xref of each input is I/O bound, so the
+        files are opened on a thread pool; the pages are still copied into
+        the output on the calling thread.
+
+        Args:
+            files: File rows (id and filepath) to open, in merge order
+            stack: Exit stack that takes ownership of every opened PDF
+
+        Returns:
+            List[pikepdf.Pdf]: The opened PDFs, in the same order as ``files``
+
+        Raises:
+            ValueError: If any of the files cannot be read as a PDF
+        """
+        workers = min(MERGE_OPEN_WORKERS, len(files))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(pikepdf.Pdf.open, file.filepath) for file in files
+            ]
+
+        # Hand every successful open to the stack before reporting a failure
+        # so that no input is left open
+        sources = []
+        for future in futures:
+            if future.exception() is None:
+                sources.append(stack.enter_context(future.result()))
+
+        for file, future in zip(files, futures):
+            error = future.exception()
+            if error is not None:
+                raise ValueError(
+                    f"Error reading file {file.id}: {str(error)}"
+                ) from error
+
+        return sources
 
     def merge_pdfs_endpoint(
         self, db: Session, request: MergePdfsRequest, current_user: User
@@ -253,7 +406,7 @@ class PDFService:
             logger.warning(
                 "Validation error in merge_pdfs_endpoint for user %s: %s",
                 current_user.id,
-                str(e),
+                e,
             )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
@@ -263,7 +416,7 @@ class PDFService:
             logger.error(
                 "Error in merge_pdfs_endpoint for user %s: %s",
                 current_user.id,
-                str(e),
+                e,
                 exc_info=True,
             )
             raise HTTPException(
@@ -33,7 +33,7 @@ class TaskExecutorService:
             yield db
         except SQLAlchemyError as e:
             db.rollback()
-            logger.error("Database error: %s", str(e), exc_info=True)
+            logger.error("Database error: %s", e, exc_info=True)
             raise DatabaseError(f"Database operation failed: {str(e)}")
         finally:
             db.close()
@@ -44,17 +44,20 @@ class TaskExecutorService:
         task_instance: Task,
         operation_name: str,
         operation_func: Callable[..., T],
-        max_retries: int = 3,
         **kwargs,
     ) -> T:
         """
-        Execute an operation with retry logic for transient failures.
+        Execute an operation inside a managed database session.
+
+        Retries are not scheduled here: the calling task declares
+        ``autoretry_for``/``retry_backoff`` and Celery reschedules it when
+        an exception propagates. ``ServiceError`` is excluded from autoretry
+        on the task decorator.
 
         Args:
             task_instance: The Celery task instance
             operation_name: Human-readable name for the operation (for logging)
             operation_func: The function to execute
-            max_retries: Maximum number of retry attempts
             **kwargs: Arguments to pass to operation_func
 
         Returns:
@@ -62,50 +65,31 @@ class TaskExecutorService:
 
         Raises:
             ServiceError: For business logic errors (not retried)
-            DatabaseError: For database errors (retried)
-            Exception: For other unexpected errors (retried)
+            DatabaseError: For database errors (retried by Celery)
+            Exception: For other unexpected errors (retried by Celery)
         """
         try:
             with cls.db_session() as db:
-                logger.info("Starting %s", operation_name)
+                logger.info(
+                    "Starting %s (retry %s)",
+                    operation_name,
+                    task_instance.request.retries,
+                )
                 result = operation_func(db=db, **kwargs)
                 logger.info("Completed %s successfully", operation_name)
                 return result
 
         except ServiceError as exc:
             # Business logic errors should not be retried
-            logger.error(
-                "Service error during %s: %s", operation_name, str(exc)
-            )
+            logger.error("Service error during %s: %s", operation_name, exc)
             raise
 
-        except DatabaseError as exc:
-            # Database errors should be retried
-            logger.error(
-                "Database error during %s (will retry): %s",
-                operation_name,
-                str(exc),
-            )
-            raise task_instance.retry(
-                exc=exc,
-                countdown=min(
-                    60 * (task_instance.request.retries or 1), 300
-                ),  # Max 5 min delay
-                max_retries=max_retries,
-            )
-
         except Exception as exc:
-            # Other unexpected errors should be retried
+            # Celery's autoretry picks this up and applies the backoff
             logger.error(
-                "Unexpected error during %s (will retry): %s",
+                "Error during %s (will retry): %s",
                 operation_name,
-                str(exc),
+                exc,
                 exc_info=True,
             )
-            raise task_instance.retry(
-                exc=exc,
-                countdown=min(
-                    60 * (task_instance.request.retries or 1), 300
-                ),  # Max 5 min delay
-                max_retries=max_retries,
-            )
+            raise
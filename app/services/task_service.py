@@ -4,13 +4,15 @@ Delegates to appropriate services for actual implementation.
 """
 
 import logging
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import ServiceError
 from app.interfaces.task_service_interface import TaskServiceInterface
-from app.services import pdf_service
+
+if TYPE_CHECKING:
+    from app.services.pdf_service import PDFService
 
 logger = logging.getLogger(__name__)
 
@@ -18,20 +20,32 @@ logger = logging.getLogger(__name__)
 class TaskService(TaskServiceInterface):
     """Service class for task-specific operations."""
 
+    def __init__(self, pdf_service: Optional["PDFService"] = None):
+        """Initialize task service with an optional PDF service."""
+        self.pdf_service = pdf_service
+
     def convert_image_to_pdf(
         self, db: Session, file_id: int, owner_id: int
     ) -> Dict[str, Any]:
-        """Convert an image to PDF using the PDF service."""
+        """
+        Convert an image to PDF using the PDF service.
+
+        Validation failures reported by the PDF service (``ValueError``) are
+        raised as ``ServiceError`` so the task fails without a retry; any
+        other exception propagates unchanged for Celery's autoretry.
+        """
         try:
-            pdf_file = pdf_service.convert_image_to_pdf(db, file_id, owner_id)
+            pdf_file = self.pdf_service.convert_image_to_pdf(
+                db, file_id, owner_id
+            )
             return {
                 "status": "success",
                 "file_id": pdf_file.id,
                 "file_path": pdf_file.filepath,
             }
-        except Exception as e:
+        except ValueError as e:
             logger.error(
-                "Failed to convert image to PDF: %s", str(e), exc_info=True
+                "Failed to convert image to PDF: %s", e, exc_info=True
             )
             raise ServiceError(
                 f"Failed to convert image to PDF: {str(e)}"
@@ -44,9 +58,13 @@ class TaskService(TaskServiceInterface):
         output_filename: str,
         owner_id: int,
     ) -> Dict[str, Any]:
-        """Merge multiple PDFs using the PDF service."""
+        """
+        Merge multiple PDFs using the PDF service.
+
+        Error handling matches :meth:`convert_image_to_pdf`.
+        """
         try:
-            merged_file = pdf_service.merge_pdfs(
+            merged_file = self.pdf_service.merge_pdfs(
                 db, file_ids, output_filename, owner_id
             )
             return {
@@ -54,10 +72,6 @@ class TaskService(TaskServiceInterface):
                 "file_id": merged_file.id,
                 "file_path": merged_file.filepath,
             }
-        except Exception as e:
-            logger.error("Failed to merge PDFs: %s", str(e), exc_info=True)
+        except ValueError as e:
+            logger.error("Failed to merge PDFs: %s", e, exc_info=True)
             raise ServiceError(f"Failed to merge PDFs: {str(e)}") from e
-
-
-# Singleton instance
-task_service = TaskService()
@@ -8,9 +8,17 @@ from typing import Any
 
 from celery import Celery
 from celery.signals import setup_logging as celery_setup_logging
+from celery.signals import worker_process_init
 
 from app.core.config import settings
 from app.core.logging_config import setup_logging as setup_app_logging
+from app.db.session import get_engine
+
+# Queues used when settings.CELERY_DEDICATED_QUEUES is enabled
+TASK_ROUTES = {
+    "convert_image_to_pdf": {"queue": "convert"},
+    "merge_pdfs": {"queue": "merge"},
+}
 
 
 def configure_celery_logging(**kwargs: Any) -> None:
@@ -26,6 +34,20 @@ def configure_celery_logging(**kwargs: Any) -> None:
     setup_app_logging()
 
 
+def reset_db_pool(**kwargs: Any) -> None:
+    """Discard database connections inherited from the parent process.
+
+    This function is connected to the Celery worker_process_init signal so
+    that each prefork child fills its own connection pool instead of sharing
+    sockets opened before the fork.
+
+    Args:
+        **kwargs: Additional keyword arguments (provided by Celery signal)
+    """
+    del kwargs  # Unused
+    get_engine().dispose(close=False)
+
+
 def create_celery_app() -> Celery:
     """Create and configure a new Celery application instance.
 
@@ -41,19 +63,27 @@ def create_celery_app() -> Celery:
 
     # Configure Celery using settings
     app.conf.update(
-        task_serializer="json",
-        accept_content=["json"],
-        result_serializer="json",
+        # msgpack keeps the int/list payloads small; json is still accepted
+        # so messages queued by older clients can be consumed
+        task_serializer="msgpack",
+        accept_content=["msgpack", "json"],
+        result_serializer="msgpack",
         timezone="UTC",
         enable_utc=True,
         task_track_started=True,
         task_time_limit=30 * 60,  # 30 minutes
         task_soft_time_limit=25 * 60,  # 25 minutes
+        # Opt-in: short conversions and long merges get separate queues
+        # (and worker pools) so a burst of merges can't starve conversions
+        task_routes=TASK_ROUTES if settings.CELERY_DEDICATED_QUEUES else None,
     )
 
     # Configure logging
     celery_setup_logging.connect(configure_celery_logging, weak=False)
 
+    # Give every worker process its own database connection pool
+    worker_process_init.connect(reset_db_pool, weak=False)
+
     return app
 
 
@@ -1,20 +1,20 @@
 """Pytest configuration and fixtures for testing."""
 
-import io
 import os
-import tempfile
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Generator
 from unittest.mock import MagicMock, patch
 
 import pytest
 from _pytest.monkeypatch import MonkeyPatch
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from passlib.context import CryptContext
 from PIL import Image
-from sqlalchemy import create_engine, event, inspect, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, insert, inspect, text
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -25,16 +25,6 @@ from app.models.file import File
 from app.models.user import User
 
 
-# Enable foreign key constraints for SQLite
-@event.listens_for(Engine, "connect")
-def set_sqlite_pragma(dbapi_connection: Any, connection_record: Any) -> None:
-    """Set SQLite pragmas for better transaction support."""
-    if settings.TESTING and "sqlite" in settings.DATABASE_URL:
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-
-
 @pytest.fixture(scope="session")
 def monkeypatch_session() -> Generator[MonkeyPatch, None, None]:
     """A session-scoped monkeypatch to prevent scope mismatch errors."""
@@ -43,21 +33,60 @@ def monkeypatch_session() -> Generator[MonkeyPatch, None, None]:
     mpatch.undo()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing(monkeypatch_session: MonkeyPatch) -> None:
+    """
+    Use the minimum bcrypt cost for the whole test session.
+
+    Hashes made at 4 rounds still go through the real bcrypt code paths,
+    they are just ~256x cheaper than the production default.
+    """
+    from app.core import security
+
+    monkeypatch_session.setattr(
+        security,
+        "pwd_context",
+        CryptContext(schemes=["bcrypt"], bcrypt__rounds=4, deprecated="auto"),
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def eager_celery(monkeypatch_session: MonkeyPatch) -> None:
+    """
+    Run Celery tasks in-process for the whole test session.
+
+    The single app built in app.worker is reconfigured in place; its tasks
+    were registered once at import and are never re-bound.
+    """
+    from app.worker import celery_app
+
+    monkeypatch_session.setattr(celery_app.conf, "task_always_eager", True)
+
+
 @pytest.fixture(scope="session")
-def temp_dir() -> Generator[Path, None, None]:
-    """Create a temporary directory for test files."""
-    temp_dir = Path(tempfile.mkdtemp())
-    yield temp_dir
-    # Cleanup is handled by the OS when the directory is removed
+def temp_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Create a temporary directory for test files.
+
+    It lives under pytest's base temp directory, so only the last few runs
+    are kept and xdist workers get their own subdirectories.
+    """
+    return tmp_path_factory.mktemp("img2pdf_test")
 
 
 @pytest.fixture(scope="session")
-def test_image() -> bytes:
-    """Generate a test image for testing file uploads and conversions."""
-    img = Image.new("RGB", (100, 100), color="white")
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return buf.getvalue()
+def test_image(pytestconfig: pytest.Config) -> bytes:
+    """
+    Provide a test image for testing file uploads and conversions.
+
+    The PNG is encoded once and kept in the pytest cache, so later runs
+    just read the bytes back.
+    """
+    path = pytestconfig.cache.mkdir("images") / "white_100x100.png"
+    if not path.exists():
+        img = Image.new("RGB", (100, 100), color="white")
+        img.save(path, format="PNG")
+    return path.read_bytes()
 
 
 @pytest.fixture(scope="session")
@@ -74,14 +103,20 @@ def test_pdf() -> bytes:
     )
 
 
+@pytest.fixture(scope="session")
+def test_password_hash() -> str:
+    """Hash "testpassword" once; hashing is deliberately slow."""
+    return get_password_hash("testpassword")
+
+
 @pytest.fixture(scope="function")
-def mock_current_user():
+def mock_current_user(test_password_hash: str):
     """Create a mock current user for testing."""
     return User(
         id=1,
         email="test@example.com",
         username="testuser",
-        hashed_password=get_password_hash("testpassword"),
+        hashed_password=test_password_hash,
         is_active=True,
         is_superuser=False,
         created_at=datetime.now(timezone.utc),
@@ -132,12 +167,10 @@ def engine() -> Engine:
         echo=bool(os.getenv("SQL_ECHO")),
     )
 
-    # Enable foreign key constraints for SQLite
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+    # Enable foreign key constraints for SQLite; StaticPool keeps the one
+    # underlying connection, so setting it once covers the whole session
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA foreign_keys=ON")
 
     return engine
 
@@ -194,34 +227,55 @@ def setup_tables(engine: Engine) -> Generator[None, None, None]:
     Base.metadata.drop_all(bind=engine)
 
 
-@pytest.fixture(scope="function")
-def db_session(engine: Engine) -> Generator[Session, None, None]:
+@pytest.fixture(scope="session")
+def _connection(
+    engine: Engine, setup_tables: None
+) -> Generator[Connection, None, None]:
     """
-    Provide a transactional scope for integration tests.
+    Hold one connection with an outer transaction open for the session.
 
-    Creates a new database session with a savepoint, and rolls back all changes
-    after the test completes, ensuring test isolation.
+    Session-scoped rows such as the shared test users are written inside
+    this transaction, and it is rolled back once all tests have run, so
+    nothing is ever persisted.
     """
     connection = engine.connect()
     transaction = connection.begin()
-    session = sessionmaker(
-        autocommit=False, autoflush=False, bind=connection
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+
+
+def _session_on(connection: Connection, **kwargs: Any) -> Session:
+    """Create a session whose commits only release a savepoint."""
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        **kwargs,
     )()
 
-    # Begin a savepoint for nested transactions
-    session.begin_nested()
 
-    @event.listens_for(session, "after_transaction_end")
-    def restart_savepoint(session, transaction):
-        if transaction.nested and not transaction._parent.nested:
-            session.begin_nested()
+@pytest.fixture(scope="function")
+def db_session(_connection: Connection) -> Generator[Session, None, None]:
+    """
+    Provide a transactional scope for integration tests.
+
+    Each test runs inside a savepoint on the session-wide connection. The
+    session's own commits only release nested savepoints, and the test's
+    savepoint is rolled back afterwards, ensuring test isolation.
+    """
+    savepoint = _connection.begin_nested()
+    session = _session_on(_connection)
 
     try:
         yield session
     finally:
         session.close()
-        transaction.rollback()
-        connection.close()
+        if savepoint.is_active:
+            savepoint.rollback()
 
 
 @pytest.fixture(scope="function")
@@ -246,96 +300,68 @@ def mock_file_model() -> MagicMock:
     return mock_file
 
 
-@pytest.fixture(scope="function")
-def test_user(db_session: Session) -> Generator[User, None, None]:
+@pytest.fixture(scope="session")
+def _session_users(
+    _connection: Connection, test_password_hash: str
+) -> tuple[User, User]:
     """
-    Create a test user with hashed password.
+    Create the shared test user and superuser in a single flush.
 
-    This fixture is function-scoped and will create a new user for each test.
-    The user is automatically cleaned up after the test completes.
+    Both rows are written once into the outer transaction, so every test
+    sees them and they are discarded when that transaction is rolled back.
+    The user is the well-known test@example.com account that the auth
+    tests log in as and that the session access token is issued for.
     """
-    from datetime import datetime, timezone
+    now = datetime.now(timezone.utc)
 
-    from app.core.security import get_password_hash
-
-    # Create a unique identifier for this test user
-    unique_id = str(uuid.uuid4().hex)[:8]
-    email = f"test_user_{unique_id}@example.com"
-    username = f"testuser_{unique_id}"
-
-    # Create test user
     user = User(
-        email=email,
-        username=username,
-        hashed_password=get_password_hash("testpassword"),
+        email="test@example.com",
+        username="testuser",
+        hashed_password=test_password_hash,
+        full_name="Test User",
         is_active=True,
         is_superuser=False,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
+        created_at=now,
+        updated_at=now,
+    )
+    superuser = User(
+        email="admin@example.com",
+        username="admin",
+        hashed_password=test_password_hash,
+        is_active=True,
+        is_superuser=True,
+        created_at=now,
+        updated_at=now,
     )
 
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-
+    # Primary keys come back from the INSERT itself; no refresh needed
+    session = _session_on(_connection, expire_on_commit=False)
     try:
-        yield user
+        session.add_all([user, superuser])
+        session.commit()
     finally:
-        # Cleanup
-        try:
-            db_session.delete(user)
-            db_session.commit()
-        except Exception as e:
-            db_session.rollback()
-            print(f"Error cleaning up test user: {e}")
-        finally:
-            db_session.close()
+        session.close()
+    return user, superuser
 
 
 @pytest.fixture(scope="function")
-def test_superuser(db_session: Session) -> Generator[User, None, None]:
+def test_user(db_session: Session, _session_users: tuple[User, User]) -> User:
     """
-    Create a test superuser.
+    Return the shared test user attached to this test's ``db_session``.
 
-    This fixture is function-scoped and will create a new superuser for each test.
-    The user is automatically cleaned up after the test completes.
+    The row is created once per session; ``merge(load=False)`` only copies
+    the already-known state into the test's session, without a SELECT, so
+    identity comparisons and lazy relationships work as usual.
     """
-    from datetime import datetime, timezone
+    return db_session.merge(_session_users[0], load=False)
 
-    from app.core.security import get_password_hash
 
-    # Create a unique identifier for this test user
-    unique_id = str(uuid.uuid4().hex)[:8]
-    email = f"test_superuser_{unique_id}@example.com"
-    username = f"testadmin_{unique_id}"
-
-    # Create test superuser
-    user = User(
-        email=email,
-        username=username,
-        hashed_password=get_password_hash("testpassword"),
-        is_active=True,
-        is_superuser=True,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-    )
-
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-
-    try:
-        yield user
-    finally:
-        # Cleanup
-        try:
-            db_session.delete(user)
-            db_session.commit()
-        except Exception as e:
-            db_session.rollback()
-            print(f"Error cleaning up test superuser: {e}")
-        finally:
-            db_session.close()
+@pytest.fixture(scope="function")
+def test_superuser(
+    db_session: Session, _session_users: tuple[User, User]
+) -> User:
+    """Return the shared test superuser attached to ``db_session``."""
+    return db_session.merge(_session_users[1], load=False)
 
 
 @pytest.fixture(scope="function")
@@ -346,7 +372,8 @@ def test_file(
     Create a test file in the database and filesystem.
 
     This fixture is function-scoped and will create a new file for each test.
-    The file is automatically cleaned up after the test completes.
+    The file is removed after the test completes; the row is rolled back
+    with the test's savepoint.
     """
     # Create a unique filename to avoid conflicts
     unique_id = str(uuid.uuid4().hex)[:8]
@@ -364,160 +391,124 @@ def test_file(
     with open(filepath, "wb") as f:
         f.write(test_content)
 
-    # Create file record in database
-    file_record = File(
-        filename=filename,
-        filepath=str(filepath.relative_to(temp_dir)),  # Store relative path
-        content_type="text/plain",
-        size=len(test_content),
-        owner_id=test_user.id,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
+    # Create file record in database, getting the row back in one trip
+    file_record = db_session.scalar(
+        insert(File)
+        .values(
+            filename=filename,
+            filepath=str(filepath.relative_to(temp_dir)),  # Relative path
+            content_type="text/plain",
+            size=len(test_content),
+            owner_id=test_user.id,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(File)
     )
 
-    db_session.add(file_record)
-    db_session.commit()
-    db_session.refresh(file_record)
-
     try:
         yield file_record
     finally:
-        # Cleanup
-        try:
-            if filepath.exists():
-                filepath.unlink()
-            db_session.delete(file_record)
-            db_session.commit()
-        except Exception as e:
-            db_session.rollback()
-            print(f"Error cleaning up test file: {e}")
-        finally:
-            db_session.close()
+        # The row goes with db_session's savepoint; only the file is ours
+        filepath.unlink(missing_ok=True)
 
 
-@pytest.fixture(scope="function")
-def authorized_client(client: TestClient, test_user: User) -> TestClient:
-    """
-    Create an authorized test client with a valid JWT token.
-    """
-    # Create access token with proper claims
-    from datetime import timedelta
-
+@pytest.fixture(scope="session")
+def access_token(_session_users: tuple[User, User]) -> str:
+    """Sign one access token for the shared test user per session."""
     from app.core.security import create_access_token
 
-    access_token_expires = timedelta(
-        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-    )
-    access_token = create_access_token(
-        data={
-            "sub": str(test_user.id),
-            "username": test_user.username,
-            "email": test_user.email,
-            "is_superuser": test_user.is_superuser,
-        },
-        expires_delta=access_token_expires,
+    return create_access_token(
+        subject=_session_users[0].email, expires_delta=timedelta(hours=24)
     )
 
-    # Set authorization header
-    client.headers.update({"Authorization": f"Bearer {access_token}"})
+
+@pytest.fixture(scope="session")
+def auth_header(access_token: str) -> dict[str, str]:
+    """Authorization header to pass explicitly as ``headers=`` per request."""
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+@pytest.fixture(scope="function")
+def authorized_client(
+    client: TestClient, auth_header: dict[str, str]
+) -> TestClient:
+    """
+    Create an authorized test client with a valid JWT token.
+
+    The header is set on the shared client and removed again by the
+    ``client`` fixture's teardown.
+    """
+    client.headers.update(auth_header)
     return client
 
 
 @pytest.fixture(scope="function")
-def celery_db_session(engine, monkeypatch):
+def celery_db_session(db_session, monkeypatch, app_instance):
     """
     Provides a database session specifically for Celery tasks during testing.
     This ensures that Celery tasks use the same test database as the main test session.
 
     This fixture:
-    1. Creates all database tables
-    2. Creates a new session bound to the test engine
-    3. Mocks the database session in the tasks module
-    4. Cleans up after the test
+    1. Reuses the test's savepoint-wrapped db_session, so task writes are
+       visible to the test and rolled back with it
+    2. Mocks the database session used by the task executor
+    3. Serves API requests from the same session
     """
-    # Create all tables in the test database
-    from app.db.base import Base
-
-    Base.metadata.create_all(bind=engine)
-
-    # Create a new session
-    TestingSessionLocal = sessionmaker(
-        autocommit=False, autoflush=False, bind=engine
-    )
-    db = TestingSessionLocal()
 
     # Create a function that will return our test session
     def get_test_db():
-        try:
-            yield db
-        finally:
-            pass  # Don't close the session here, let the fixture handle it
+        yield db_session
 
-    # Apply the mock to the tasks module
-    monkeypatch.setattr("app.tasks.get_db", get_test_db)
+    # Apply the mock where the tasks get their sessions from
+    monkeypatch.setattr("app.services.task_executor.get_db", get_test_db)
 
-    # Also patch the get_db dependency in the main app
-    from app.api.deps import get_db as original_get_db
-    from app.main import app
+    # Also serve API requests from the same session
+    monkeypatch.setattr(app_instance.state, "test_db", db_session)
 
-    # Store the original function so we can restore it later
-    original_get_db_fn = getattr(
-        original_get_db, "_original_get_db", original_get_db
-    )
+    return db_session
 
-    # Create a wrapper that will use our test session
-    def get_db_override():
-        try:
-            yield db
-        finally:
-            pass  # Don't close the session here, let the fixture handle it
 
-    # Mark the original function so we can find it later
-    get_db_override._original_get_db = original_get_db_fn
+@pytest.fixture(scope="session")
+def app_instance() -> FastAPI:
+    """
+    Build the FastAPI application once for the whole test session.
 
-    # Apply the override
-    app.dependency_overrides[original_get_db_fn] = get_db_override
+    get_db is overridden here, once, to return whichever session the
+    running test stored in ``app.state.test_db``.
+    """
+    from app.db.session import get_db
+    from app.main import create_app
+
+    app = create_app()
+    app.state.test_db = None
+    app.dependency_overrides[get_db] = lambda: app.state.test_db
+    return app
 
-    try:
-        yield db
-    finally:
-        # Clean up
-        db.rollback()
-        db.close()
 
-        # Remove the override
-        if original_get_db_fn in app.dependency_overrides:
-            del app.dependency_overrides[original_get_db_fn]
+@pytest.fixture(scope="session")
+def _test_client(app_instance: FastAPI) -> Generator[TestClient, None, None]:
+    """Open a single TestClient (and app lifespan) for the session."""
+    with TestClient(app_instance) as test_client:
+        yield test_client
 
 
 @pytest.fixture(scope="function")
-def client(engine):
+def client(
+    app_instance: FastAPI, _test_client: TestClient, db_session: Session
+) -> Generator[TestClient, None, None]:
     """
     Provides a FastAPI TestClient for integration tests.
-    Creates a new database session for each test and overrides the get_db dependency.
-    """
-    from fastapi.testclient import TestClient
-
-    from app.api.deps import get_db
-    from app.main import app
-
-    # Create a new session for the test
-    TestingSessionLocal = sessionmaker(
-        autocommit=False, autoflush=False, bind=engine
-    )
-
-    def override_get_db():
-        try:
-            db = TestingSessionLocal()
-            yield db
-        finally:
-            db.close()
 
-    # Override the get_db dependency
-    app.dependency_overrides[get_db] = override_get_db
-
-    with TestClient(app) as test_client:
-        yield test_client
+    The app and client are shared across the session; each test only
+    hands the app its own rolled-back db_session and gets the client back
+    without leftover headers or cookies.
+    """
+    app_instance.state.test_db = db_session
 
-    # Clear overrides after the test
-    app.dependency_overrides.clear()
+    try:
+        yield _test_client
+    finally:
+        app_instance.state.test_db = None
+        _test_client.headers.pop("Authorization", None)
+        _test_client.cookies.clear()
@@ -5,8 +5,9 @@ from typing import Dict, Optional
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
 
-from app.core.security import create_access_token
+from app.core.security import create_access_token, get_password_hash
 from app.models.user import User
 from tests.integration.api.v1.auth.test_data.auth_test_data import (
     LOGIN_PARAM_NAMES, LOGIN_PARAM_VALUES, REGISTRATION_PARAM_NAMES,
@@ -23,6 +24,20 @@ class TestAuthEndpoints:
     - Token validation
     """
 
+    @pytest.fixture
+    def inactive_user(self, db_session: Session) -> User:
+        """Create the deactivated account used by the inactive login case."""
+        user = User(
+            email="inactive@example.com",
+            username="inactive",
+            hashed_password=get_password_hash("testpass123"),
+            is_active=False,
+            is_superuser=False,
+        )
+        db_session.add(user)
+        db_session.flush()
+        return user
+
     @pytest.mark.parametrize(
         LOGIN_PARAM_NAMES,
         LOGIN_PARAM_VALUES,
@@ -30,9 +45,9 @@ class TestAuthEndpoints:
     )
     def test_login_parameterized(
         self,
+        request: pytest.FixtureRequest,
         client: TestClient,
         test_user: User,
-        inactive_user: User,
         test_name: str,
         username: str,
         password: str,
@@ -49,6 +64,10 @@ class TestAuthEndpoints:
         - Empty username/password
         - Various edge cases
         """
+        # Only the inactive case needs the extra account
+        if test_name == "inactive_user":
+            request.getfixturevalue("inactive_user")
+
         # Make the login request
         response = client.post(
             "/api/v1/auth/login/access-token",
@@ -57,13 +76,12 @@ class TestAuthEndpoints:
         )
 
         # Verify the response
+        response_data = response.json()
         assert response.status_code == expected_status, (
             f"Expected status {expected_status} but got {response.status_code}. "
-            f"Response: {response.json()}"
+            f"Response: {response_data}"
         )
 
-        response_data = response.json()
-
         if expected_status == 200:
             assert (
                 "access_token" in response_data
@@ -80,35 +98,36 @@ class TestAuthEndpoints:
                 "detail" in response_data
             ), "Expected error details in response"
 
-    def test_read_users_me_authenticated(
-        self, authorized_client: TestClient
+    @pytest.mark.parametrize(
+        "client_fixture,expected_status,expected_detail",
+        [
+            ("authorized_client", 200, None),
+            ("client", 401, "Not authenticated"),
+        ],
+        ids=["valid_token", "without_token"],
+    )
+    def test_read_users_me(
+        self,
+        request: pytest.FixtureRequest,
+        client_fixture: str,
+        expected_status: int,
+        expected_detail: Optional[str],
     ) -> None:
-        """Test accessing protected endpoint with valid token."""
-        response = authorized_client.get("/api/v1/auth/me")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["email"] == "test@example.com"
-        assert "hashed_password" not in data
+        """Test accessing the user profile with and without a valid token."""
+        client = request.getfixturevalue(client_fixture)
 
-    def test_read_users_me_unauthenticated(self, client: TestClient) -> None:
-        """Test accessing protected endpoint without authentication."""
         response = client.get("/api/v1/auth/me")
-        assert response.status_code == 401
-        assert "Not authenticated" in response.json()["detail"]
-
-    def test_read_users_me_expired_token(self, client: TestClient) -> None:
-        """Test accessing protected endpoint with expired token."""
-        # Create an expired token
-        expired_token = create_access_token(
-            data={"sub": "test@example.com"},
-            expires_delta=timedelta(minutes=-5),
-        )
-        response = client.get(
-            "/api/v1/auth/me",
-            headers={"Authorization": f"Bearer {expired_token}"},
-        )
-        assert response.status_code == 401
-        assert "Token has expired" in response.json()["detail"]
+
+        assert response.status_code == expected_status
+        data = response.json()
+        if expected_detail:
+            assert expected_detail in data["detail"]
+        else:
+            assert data["email"] == TEST_USER_EMAIL
+            assert "hashed_password" not in data
+            assert data["is_active"] is True
+            assert data["is_superuser"] is False
+            assert "id" in data
 
     @pytest.mark.parametrize(
         REGISTRATION_PARAM_NAMES,
@@ -137,16 +156,16 @@ class TestAuthEndpoints:
             headers={"Content-Type": "application/json"},
         )
 
+        response_data = response.json()
         assert response.status_code == expected_status, (
             f"Expected status {expected_status} but got {response.status_code}. "
-            f"Response: {response.json()}"
+            f"Response: {response_data}"
         )
 
-        response_data = response.json()
-
         if expected_status == 200:
             assert "id" in response_data, "User ID not in response"
             assert response_data["email"] == user_data["email"]
+            assert response_data["full_name"] == user_data["full_name"]
             assert response_data["is_active"] is True
             assert "hashed_password" not in response_data
         elif expected_status >= 400 and expected_detail:
@@ -154,53 +173,34 @@ class TestAuthEndpoints:
                 "detail", ""
             ), "Unexpected error detail"
 
-    def test_read_users_me_with_valid_token(
-        self, authorized_client: TestClient
-    ) -> None:
-        """Test accessing user profile with valid authentication token."""
-        response = authorized_client.get("/api/v1/auth/me")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["email"] == TEST_USER_EMAIL
-        assert "hashed_password" not in data
-        assert data["is_active"] is True
-        assert data["is_superuser"] is False
-        assert "id" in data
-
-    def test_read_users_me_with_invalid_token(
-        self, client: TestClient
-    ) -> None:
-        """Test accessing user profile with invalid token."""
-        response = client.get(
-            "/api/v1/auth/me",
-            headers={"Authorization": "Bearer invalid.token.here"},
-        )
-        assert response.status_code == 401
-        assert "Could not validate credentials" in response.json()["detail"]
-
-    def test_read_users_me_with_expired_token(
-        self, client: TestClient
+    @pytest.mark.parametrize(
+        "token_kind,expected_detail",
+        [
+            ("invalid", "Could not validate credentials"),
+            ("expired", "Token has expired"),
+        ],
+        ids=["invalid_token", "expired_token"],
+    )
+    def test_read_users_me_with_bad_token(
+        self, client: TestClient, token_kind: str, expected_detail: str
     ) -> None:
-        """Test accessing user profile with expired token."""
-        # Create an expired token (5 minutes in the past)
-        expired_token = create_access_token(
-            data={"sub": TEST_USER_EMAIL},
-            expires_delta=timedelta(minutes=-5),
-        )
+        """Test accessing user profile with an invalid or expired token."""
+        if token_kind == "expired":
+            # Create an expired token (5 minutes in the past)
+            token = create_access_token(
+                subject=TEST_USER_EMAIL,
+                expires_delta=timedelta(minutes=-5),
+            )
+        else:
+            token = "invalid.token.here"
 
         response = client.get(
             "/api/v1/auth/me",
-            headers={"Authorization": f"Bearer {expired_token}"},
+            headers={"Authorization": f"Bearer {token}"},
         )
 
         assert response.status_code == 401
-        assert "Token has expired" in response.json()["detail"]
-
-    def test_read_users_me_without_token(self, client: TestClient) -> None:
-        """Test accessing user profile without any authentication token."""
-        response = client.get("/api/v1/auth/me")
-        assert response.status_code == 401
-        assert "Not authenticated" in response.json()["detail"]
+        assert expected_detail in response.json()["detail"]
 
     def test_refresh_token(self, client: TestClient, test_user: User) -> None:
         """Test token refresh endpoint."""
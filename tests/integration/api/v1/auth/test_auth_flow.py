@@ -1,42 +1,42 @@
 """Integration tests for authentication flow."""
 
-import os
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
 import pytest
-import requests
-from dotenv import load_dotenv
+from fastapi.testclient import TestClient
 
-# Load environment variables
-load_dotenv()
-
-# API configuration
-# Use 'web' as the hostname when running in Docker Compose
-BASE_URL = os.getenv("API_BASE_URL", "http://web:8000")
 API_PREFIX = "/api/v1"
 
-# Test user credentials
-TEST_USER = {
-    "email": "testuser@example.com",
-    "username": "testuser",
-    "password": "testpassword123",
-    "full_name": "Test User",
-}
+# Test user credentials, read-only so no test can leak changes into another
+TEST_USER: Mapping[str, str] = MappingProxyType(
+    {
+        "email": "testuser@example.com",
+        "username": "flowuser",
+        "password": "testpassword123",
+        "full_name": "Test User",
+    }
+)
 
 
 class TestAuthFlow:
     """Test the authentication flow of the application."""
 
+    @pytest.fixture(autouse=True)
+    def _bind_client(self, client: TestClient) -> None:
+        """Send this test's requests through the in-process client."""
+        self._client = client
+
     @pytest.fixture(scope="class")
-    def test_user(self) -> Dict[str, str]:
-        """Return test user data."""
-        return TEST_USER.copy()
+    def flow_user(self) -> Mapping[str, str]:
+        """Return the read-only test user data."""
+        return TEST_USER
 
     def make_request(
         self, method: str, endpoint: str, token: Optional[str] = None, **kwargs
     ) -> Dict:
-        """Make an HTTP request to the API."""
-        url = f"{BASE_URL}{API_PREFIX}{endpoint}"
+        """Make a request to the API and return the decoded body."""
+        url = f"{API_PREFIX}{endpoint}"
 
         # Get any existing headers from kwargs or initialize empty dict
         headers = kwargs.pop("headers", {})
@@ -45,39 +45,30 @@ class TestAuthFlow:
         if token:
             headers["Authorization"] = f"Bearer {token}"
 
-        print(f"\nMaking {method.upper()} request to {endpoint}")
-        response = requests.request(method, url, headers=headers, **kwargs)
+        response = self._client.request(method, url, headers=headers, **kwargs)
 
-        print(f"Status Code: {response.status_code}")
         try:
-            response_data = response.json()
-            print("Response:", response_data)
+            return response.json()
         except ValueError:
-            print("Response: (non-JSON)")
-            response_data = {}
-
-        return response_data
+            return {}
 
-    def test_user_registration(self, test_user: Dict[str, str]) -> None:
-        """Test user registration."""
-        # First, try to register a new user
-        response = self.make_request("POST", "/auth/register", json=test_user)
-
-        if response.get("detail") == "Email already registered":
-            print("User already exists, continuing with login...")
-            return
+    def _register(self, flow_user: Mapping[str, str]) -> None:
+        """Register the flow user and check the created account."""
+        response = self.make_request(
+            "POST", "/auth/register", json=dict(flow_user)
+        )
 
         assert response.get("id") is not None, "User ID not in response"
-        assert response.get("email") == test_user["email"], "Email mismatch"
+        assert response.get("email") == flow_user["email"], "Email mismatch"
 
-    def test_user_login(self, test_user: Dict[str, str]) -> str:
-        """Test user login and return the access token."""
+    def _login(self, flow_user: Mapping[str, str]) -> str:
+        """Log the flow user in and return the access token."""
         response = self.make_request(
             "POST",
             "/auth/login/access-token",
             data={
-                "username": test_user["email"],
-                "password": test_user["password"],
+                "username": flow_user["email"],
+                "password": flow_user["password"],
             },
             headers={"Content-Type": "application/x-www-form-urlencoded"},
         )
@@ -87,31 +78,26 @@ class TestAuthFlow:
 
         return response["access_token"]
 
-    def test_protected_endpoints(self, test_user: Dict[str, str]) -> None:
-        """Test access to protected endpoints."""
-        # First get a valid token
-        token = self.test_user_login(test_user)
-
+    def _check_protected_endpoints(
+        self, flow_user: Mapping[str, str], token: str
+    ) -> None:
+        """Check that the token opens the protected endpoints."""
         # Test access to user profile
         response = self.make_request("GET", "/users/me", token=token)
         assert (
-            response.get("email") == test_user["email"]
+            response.get("email") == flow_user["email"]
         ), "User email mismatch"
 
         # Test access to protected files endpoint
         response = self.make_request("GET", "/files/", token=token)
         assert isinstance(response, list), "Expected a list of files"
 
-    def test_full_auth_flow(self, test_user: Dict[str, str]) -> None:
-        """Test the full authentication flow in one test."""
-        # Test registration
-        self.test_user_registration(test_user)
-
-        # Test login
-        token = self.test_user_login(test_user)
-
-        # Test protected endpoints
-        self.test_protected_endpoints(test_user)
+    def test_full_auth_flow(self, flow_user: Mapping[str, str]) -> None:
+        """Test registration, login and protected access in one pass.
 
-        # If we get here without exceptions, all tests passed
-        assert True
+        The test runs in its own rolled-back transaction, so the flow user
+        is always registered fresh.
+        """
+        self._register(flow_user)
+        token = self._login(flow_user)
+        self._check_protected_endpoints(flow_user, token)
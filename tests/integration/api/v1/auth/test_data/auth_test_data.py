@@ -1,6 +1,6 @@
 """Test data for authentication endpoint tests."""
 
-from datetime import timedelta
+from operator import itemgetter
 from typing import Dict, List, Optional, TypedDict
 
 
@@ -119,27 +119,18 @@ REGISTRATION_PARAM_NAMES = (
     "test_name,user_data,expected_status,expected_detail"
 )
 
-# Convert test cases to parameter values
-LOGIN_PARAM_VALUES = [
-    (
-        tc["test_name"],
-        tc["username"],
-        tc["password"],
-        tc["expected_status"],
-        tc["expected_detail"],
-    )
-    for tc in LOGIN_TEST_CASES
-]
+# Convert test cases to parameter values, pulling the fields named above
+# out of each case in parameter order
+LOGIN_PARAM_VALUES = list(
+    map(itemgetter(*LOGIN_PARAM_NAMES.split(",")), LOGIN_TEST_CASES)
+)
 
-REGISTRATION_PARAM_VALUES = [
-    (
-        tc["test_name"],
-        tc["user_data"],
-        tc["expected_status"],
-        tc["expected_detail"],
+REGISTRATION_PARAM_VALUES = list(
+    map(
+        itemgetter(*REGISTRATION_PARAM_NAMES.split(",")),
+        REGISTRATION_TEST_CASES,
     )
-    for tc in REGISTRATION_TEST_CASES
-]
+)
 
 # Common test data
 TEST_USER_EMAIL = "test@example.com"
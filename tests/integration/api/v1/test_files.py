@@ -1,12 +1,12 @@
 """Tests for file operations API endpoints."""
 
 import io
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 import pytest
 from fastapi.testclient import TestClient
-from PIL import Image, ImageDraw
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -26,6 +26,8 @@ class TestFile(BaseModel):
         cls, width: int = 100, height: int = 100, color: str = "black"
     ) -> "TestFile":
         """Create a test image file."""
+        from PIL import Image, ImageDraw
+
         img = Image.new("RGB", (width, height), color=color)
         draw = ImageDraw.Draw(img)
         # Add some content to make the file non-empty
@@ -45,51 +47,36 @@ class TestFile(BaseModel):
     @classmethod
     def create_test_pdf(cls, page_count: int = 1) -> "TestFile":
         """Create a test PDF file with the specified number of pages."""
-        # This is a minimal PDF file with the specified number of pages
-        pdf_parts = [
-            b"%PDF-1.4\n",
-            b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n",
-            f"2 0 obj\n<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in range(3, 3 + page_count))}] /Count {page_count} >>\nendobj\n".encode(
-                "utf-8"
-            ),
-        ]
-
-        # Add pages
-        for i in range(page_count):
-            pdf_parts.append(
-                f"{i + 3} 0 obj\n<< /Type /Page /Parent 2 0 R /Resources << >> /MediaBox [0 0 612 792] >>\nendobj\n".encode(
-                    "utf-8"
-                )
-            )
-
-        # Add xref and trailer
-        xref_offset = sum(len(part) for part in pdf_parts)
-        xref = [
-            b"xref\n",
-            f"0 {3 + page_count}\n".encode("utf-8"),
-            b"0000000000 65535 f \n",  # First object is always free
+        # This is a minimal PDF file with the specified number of pages.
+        # It is plain ASCII, so string lengths are byte offsets and the
+        # whole document can be rendered as text and encoded once.
+        kids = " ".join(f"{i} 0 R" for i in range(3, 3 + page_count))
+        page = (
+            "<< /Type /Page /Parent 2 0 R /Resources << >> "
+            "/MediaBox [0 0 612 792] >>"
+        )
+        objects = [
+            "<< /Type /Catalog /Pages 2 0 R >>",
+            f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>",
+            *[page] * page_count,
         ]
 
-        # Add xref entries for each object
-        offset = 0
-        for i in range(
-            1, 3 + page_count
-        ):  # +3 for catalog, pages, and each page
-            xref.append(f"{offset:010d} 00000 n \n".encode("ascii"))
-            if i < len(pdf_parts) - 1:  # Not the last part
-                offset += len(pdf_parts[i - 1])
-
-        pdf_parts.extend(xref)
-
-        # Add trailer
-        trailer = [
-            b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (3 + page_count),
-            b"startxref\n%d\n" % xref_offset,
-            b"%%EOF",
-        ]
-        pdf_parts.extend(trailer)
+        parts = ["%PDF-1.4\n"]
+        position = len(parts[0])
+        xref = [f"xref\n0 {len(objects) + 1}\n", "0000000000 65535 f \n"]
+        for number, body in enumerate(objects, start=1):
+            part = f"{number} 0 obj\n{body}\nendobj\n"
+            xref.append(f"{position:010d} 00000 n \n")
+            parts.append(part)
+            position += len(part)
+
+        parts.extend(xref)
+        parts.append(
+            f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{position}\n%%EOF"
+        )
 
-        content = b"".join(pdf_parts)
+        content = "".join(parts).encode("ascii")
 
         return cls(
             filename=f"test_document_{page_count}_pages.pdf",
@@ -99,14 +86,30 @@ class TestFile(BaseModel):
         )
 
 
-# Test files with different scenarios
-TEST_FILES = {
-    "small_image": TestFile.create_test_image(100, 100, "white"),
-    "large_image": TestFile.create_test_image(2000, 2000, "blue"),
-    "single_page_pdf": TestFile.create_test_pdf(1),
-    "multi_page_pdf": TestFile.create_test_pdf(5),
+# A 22x22 solid black RGB PNG, stored as bytes so the upload tests need no
+# encoder at all
+BLACK_PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x16\x00\x00\x00\x16"
+    b"\x08\x02\x00\x00\x00K\xd6\xfbl\x00\x00\x00\x14IDATx\xdac`\x18\x05\xa3"
+    b"`\x14\x8c\x82Q04\x01\x00\x05\xc2\x00\x01\x99\x83\x1f\x9a\x00\x00\x00\x00"
+    b"IEND\xaeB`\x82"
+)
+
+# Test files with different scenarios, built on first use by get_test_file
+TEST_FILES: Dict[str, Callable[[], TestFile]] = {
+    "small_image": partial(TestFile.create_test_image, 100, 100, "white"),
+    "large_image": partial(TestFile.create_test_image, 2000, 2000, "blue"),
+    "single_page_pdf": partial(TestFile.create_test_pdf, 1),
+    "multi_page_pdf": partial(TestFile.create_test_pdf, 5),
 }
 
+
+@lru_cache(maxsize=None)
+def get_test_file(file_type: str) -> TestFile:
+    """Build the named test file once and reuse it for later cases."""
+    return TEST_FILES[file_type]()
+
+
 # Test cases for file upload
 UPLOAD_TEST_CASES = [
     # (test_name, file_type, expected_status, expected_detail)
@@ -135,53 +138,42 @@ DELETE_TEST_CASES = [
 class TestFileOperations:
     """Test file operations including upload, download, list, and delete."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def test_image(self) -> bytes:
-        """Generate a test image for upload tests."""
-        img = Image.new("RGB", (22, 22), color="black")
-        buf = io.BytesIO()
-        img.save(buf, format="PNG")
-        return buf.getvalue()
+        """Return the fixed black PNG used by the upload tests."""
+        return BLACK_PNG
 
     @pytest.fixture
-    def test_pdf(self) -> bytes:
-        """Generate a simple PDF file for testing."""
-        # This is a minimal PDF file with a single blank page
-        return (
-            b"%PDF-1.4\n"
-            b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n"
-            b"2 0 obj\n<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n"
-            b"3 0 obj\n<< /Type /Page /Parent 2 0 R /Resources << >> /MediaBox [0 0 612 792] >>\nendobj\n"
-            b"xref\n0 4\n0000000000 65535 f \n0000000015 00000 n \n0000000060 00000 n \n0000000116 00000 n \n"
-            b"trailer\n<< /Size 4 /Root 1 0 R >>\nstartxref\n190\n%%EOF"
-        )
+    def upload_file(self, request: pytest.FixtureRequest) -> TestFile:
+        """Resolve a parametrized file type to the file to upload."""
+        file_type = request.param
+        if file_type == "nonexistent":
+            return TestFile(
+                filename="nonexistent.txt",
+                content=b"",
+                content_type="text/plain",
+                size=0,
+            )
+        if file_type not in TEST_FILES:
+            pytest.skip(f"Test file type '{file_type}' not defined")
+        return get_test_file(file_type)
 
     @pytest.mark.parametrize(
-        "test_name, file_type, expected_status, expected_detail",
+        "test_name, upload_file, expected_status, expected_detail",
         UPLOAD_TEST_CASES,
         ids=[tc[0] for tc in UPLOAD_TEST_CASES],
+        indirect=["upload_file"],
     )
     def test_upload_file_parameterized(
         self,
         authorized_client: TestClient,
         test_name: str,
-        file_type: str,
+        upload_file: TestFile,
         expected_status: int,
         expected_detail: Optional[str],
     ) -> None:
         """Test uploading different types of files with various scenarios."""
-        if file_type not in TEST_FILES and file_type != "nonexistent":
-            pytest.skip(f"Test file type '{file_type}' not defined")
-
-        test_file = TEST_FILES.get(
-            file_type,
-            {
-                "filename": "nonexistent.txt",
-                "content": b"",
-                "content_type": "text/plain",
-                "size": 0,
-            },
-        )
+        test_file = upload_file
 
         response = authorized_client.post(
             "/api/v1/files/upload-image/",
@@ -203,10 +195,12 @@ class TestFileOperations:
             assert data["content_type"] == test_file.content_type
             assert data["size"] == test_file.size
 
-            # Verify file exists on disk
-            file_path = Path(data["filepath"])
-            assert file_path.exists()
-            assert file_path.stat().st_size == test_file.size
+            # Verify file exists on disk with one stat call
+            try:
+                file_stat = Path(data["filepath"]).stat()
+            except FileNotFoundError:
+                pytest.fail(f"Uploaded file missing: {data['filepath']}")
+            assert file_stat.st_size == test_file.size
         elif expected_detail:
             assert expected_detail in response.json().get("detail", "")
 
@@ -232,7 +226,7 @@ class TestFileOperations:
                 pytest.skip(f"Test file type '{file_type}' not defined")
 
             # Upload a test file first
-            test_file = TEST_FILES[file_type]
+            test_file = get_test_file(file_type)
             upload_response = authorized_client.post(
                 "/api/v1/files/upload-image/",
                 files={
@@ -286,7 +280,7 @@ class TestFileOperations:
                 pytest.skip(f"Test file type '{file_type}' not defined")
 
             # Upload a test file first
-            test_file = TEST_FILES[file_type]
+            test_file = get_test_file(file_type)
             upload_response = authorized_client.post(
                 "/api/v1/files/upload-image/",
                 files={
@@ -352,9 +346,7 @@ class TestFileOperations:
 
         # Verify file exists in database
         file_id = data["id"]
-        file_db = (
-            db_session.query(FileModel).filter(FileModel.id == file_id).first()
-        )
+        file_db = db_session.get(FileModel, file_id)
         assert file_db is not None
         assert Path(file_db.filepath).exists()
 
@@ -438,9 +430,7 @@ class TestFileOperations:
 
         # In test environment with eager tasks, the conversion is synchronous
         file_id = data["file_id"]
-        pdf_file = (
-            db_session.query(FileModel).filter(FileModel.id == file_id).first()
-        )
+        pdf_file = db_session.get(FileModel, file_id)
 
         assert pdf_file is not None
         assert pdf_file.content_type == "application/pdf"
@@ -483,11 +473,7 @@ class TestFileOperations:
 
         # In test environment with eager tasks, the merge is synchronous
         merged_file_id = data["file_id"]
-        merged_file = (
-            db_session.query(FileModel)
-            .filter(FileModel.id == merged_file_id)
-            .first()
-        )
+        merged_file = db_session.get(FileModel, merged_file_id)
 
         assert merged_file is not None
         assert merged_file.content_type == "application/pdf"
@@ -1,12 +1,10 @@
 """Tests for PDF generation API endpoints."""
 
-import io
 from pathlib import Path
 from typing import Any, Dict
 
 import pytest
 from fastapi.testclient import TestClient
-from PIL import Image
 from sqlalchemy.orm import Session
 
 from app.models.file import File as FileModel
@@ -15,14 +13,6 @@ from app.models.file import File as FileModel
 class TestPDFEndpoints:
     """Test PDF generation and manipulation endpoints."""
 
-    @pytest.fixture
-    def test_image(self) -> bytes:
-        """Generate a test image for PDF generation tests."""
-        img = Image.new("RGB", (100, 100), color="white")
-        buf = io.BytesIO()
-        img.save(buf, format="PNG")
-        return buf.getvalue()
-
     @pytest.fixture
     def uploaded_files(
         self, authorized_client: TestClient, test_image: bytes
@@ -64,7 +54,7 @@ class TestPDFEndpoints:
         assert "file_id" in data
 
         # Verify the PDF file was created
-        pdf_file = db_session.query(FileModel).get(data["file_id"])
+        pdf_file = db_session.get(FileModel, data["file_id"])
         assert pdf_file is not None
         assert pdf_file.content_type == "application/pdf"
         assert pdf_file.filename.endswith(".pdf")
@@ -98,7 +88,7 @@ class TestPDFEndpoints:
         assert "file_id" in data
 
         # Verify the merged PDF was created
-        merged_file = db_session.query(FileModel).get(data["file_id"])
+        merged_file = db_session.get(FileModel, data["file_id"])
         assert merged_file is not None
         assert merged_file.content_type == "application/pdf"
         assert "merged_" in merged_file.filename
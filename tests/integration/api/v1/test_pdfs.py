@@ -1,40 +1,24 @@
 import io
-import logging
 import os
 import sqlite3
-import time
 from pathlib import Path
 
-from PIL import Image
-from sqlalchemy import event, text
-from sqlalchemy.engine import Engine
-
-# Enable SQL logging
-logging.basicConfig()
-logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
-
-
-# Print SQL statements to console
-@event.listens_for(Engine, "before_cursor_execute")
-def receive_before_cursor_execute(
-    conn, cursor, statement, params, context, executemany
-):
-    conn.info.setdefault("query_start_time", []).append(time.time())
-    print(f"\n=== SQL QUERY ===\n{statement}")
-    if params:
-        print(f"=== PARAMS ===\n{params}")
-
-
-@event.listens_for(Engine, "after_cursor_execute")
-def receive_after_cursor_execute(
-    conn, cursor, statement, params, context, executemany
-):
-    total = time.time() - conn.info["query_start_time"].pop(-1)
-    print(f"=== QUERY COMPLETE in {total:.6f}s ===\n")
-
+from sqlalchemy import text
 
 from app.models.file import File as FileModel
 
+# A 100x100 solid red RGB PNG, stored as bytes so the test needs no encoder
+RED_PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00d\x00\x00\x00d\x08\x02"
+    b"\x00\x00\x00\xff\x80\x02\x03\x00\x00\x00\x90IDATx\xda\xed\xd01\r\x00\x00"
+    b"\x08\xc0\xb0\xf97\r\x16\xf8x\x9aTA\x9b\xe2H\x81,Y\xb2d\xc9B\x81,Y\xb2d"
+    b"\xc9B\x81,Y\xb2d\xc9B\x81,Y\xb2d\xc9B\x81,Y\xb2d\xc9B\x81,Y\xb2d\xc9B"
+    b"\x81,Y\xb2d\xc9B\x81,Y\xb2d\xc9B\x81,Y\xb2d\xc9B\x81,Y\xb2d\xc9B\x81,Y"
+    b"\xb2d\xc9B\x81,Y\xb2d\xc9B\x81,Y\xb2d\xc9B\x81,Y\xb2d\xc9B\x81,Y\xb2d"
+    b"\xc9B\x81,Y\xb2d\xc9B\x81,Y\xef\x16\x9e-\xeb+\xa0sr\xcd\x00\x00\x00\x00I"
+    b"END\xaeB`\x82"
+)
+
 # Polling mechanism removed - Celery tasks now run in eager mode during tests
 
 
@@ -85,7 +69,6 @@ def test_merge_pdfs(
     db_engine,
     db_session,
     celery_db_session,
-    tmp_path,
     test_user,
 ):
     """
@@ -157,21 +140,18 @@ def test_merge_pdfs(
     print(f"Test user email: {test_user.email}")
     print(f"Test user id: {test_user.id}")
 
-    # Step 1: Generate a valid test image and upload it twice
-    image = Image.new("RGB", (100, 100), color="red")
-    image_bytes_io = io.BytesIO()
-    image.save(image_bytes_io, format="PNG")
-    image_content = image_bytes_io.getvalue()
-
+    # Step 1: Upload the test image twice
     for i in range(1, 3):
-        image_path = tmp_path / f"test_image_{i}.png"
-        image_path.write_bytes(image_content)
-
-        with open(image_path, "rb") as f:
-            response = client.post(
-                "/files/upload-image",
-                files={"file": (image_path.name, f, "image/png")},
-            )
+        response = client.post(
+            "/files/upload-image",
+            files={
+                "file": (
+                    f"test_image_{i}.png",
+                    io.BytesIO(RED_PNG),
+                    "image/png",
+                )
+            },
+        )
         assert (
             response.status_code == 200
         ), f"Failed to upload image: {response.text}"
@@ -207,11 +187,7 @@ def test_merge_pdfs(
     merged_pdf_id = task_data["task_result"]
 
     # Step 4: Verify the merged PDF exists and download it
-    merged_file_db = (
-        db_session.query(FileModel)
-        .filter(FileModel.id == merged_pdf_id)
-        .first()
-    )
+    merged_file_db = db_session.get(FileModel, merged_pdf_id)
     assert merged_file_db is not None
     assert Path(merged_file_db.filepath).exists()
     created_files.append(Path(merged_file_db.filepath))
@@ -224,9 +200,7 @@ def test_merge_pdfs(
 
     # Step 5: Clean up all created files
     for file_id in pdf_file_ids:
-        file_db = (
-            db_session.query(FileModel).filter(FileModel.id == file_id).first()
-        )
+        file_db = db_session.get(FileModel, file_id)
         if file_db and Path(file_db.filepath).exists():
             created_files.append(Path(file_db.filepath))
 
@@ -1,25 +1,20 @@
 """Tests for database connection and schema."""
 
-import pytest
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import inspect
 
-from app.core.config import settings
 from app.db.base import Base
 
 
-def test_db_connection():
+def test_db_connection(db_engine):
     """Test that we can connect to the database."""
-    engine = create_engine(settings.DATABASE_URL)
-    connection = engine.connect()
+    connection = db_engine.connect()
     assert connection is not None
     connection.close()
 
 
-def test_required_tables_exist():
+def test_required_tables_exist(db_engine):
     """Test that all required database tables exist."""
-    engine = create_engine(settings.DATABASE_URL)
-    inspector = inspect(engine)
+    inspector = inspect(db_engine)
 
     # Get all table names from SQLAlchemy metadata
     expected_tables = set(Base.metadata.tables.keys())
@@ -32,10 +27,9 @@ def test_required_tables_exist():
     assert not missing_tables, f"Missing tables: {missing_tables}"
 
 
-def test_table_columns():
+def test_table_columns(db_engine):
     """Test that required columns exist in each table."""
-    engine = create_engine(settings.DATABASE_URL)
-    inspector = inspect(engine)
+    inspector = inspect(db_engine)
 
     for table_name, table in Base.metadata.tables.items():
         # Get expected columns
@@ -32,7 +32,7 @@ def mock_current_user():
     return user
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def app():
     """Create a test FastAPI app with the pdfs router."""
     app = FastAPI()
@@ -40,8 +40,15 @@ def app():
     return app
 
 
+@pytest.fixture(scope="module")
+def module_client(app):
+    """Start the client (and the app's no-op lifespan) once per module."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
 @pytest.fixture
-def client(app, mock_db, mock_current_user):
+def client(app, module_client, mock_db, mock_current_user):
     """Create a test client with mocked dependencies."""
 
     # Mock dependencies
@@ -60,8 +67,10 @@ def client(app, mock_db, mock_current_user):
     # Configure test settings
     settings.TESTING = True
 
-    with TestClient(app) as test_client:
-        yield test_client
+    try:
+        yield module_client
+    finally:
+        app.dependency_overrides.clear()
 
 
 @patch("app.api.v1.endpoints.pdfs.pdf_service.merge_pdfs_endpoint")
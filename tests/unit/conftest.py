@@ -4,11 +4,9 @@ from typing import Generator
 from unittest.mock import MagicMock, patch
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from app.db.session import get_db
-from app.main import create_app
-
 
 @pytest.fixture
 def mock_db() -> Generator[MagicMock, None, None]:
@@ -18,21 +16,19 @@ def mock_db() -> Generator[MagicMock, None, None]:
 
 
 @pytest.fixture
-def client(mock_db: MagicMock) -> TestClient:
+def client(
+    mock_db: MagicMock, app_instance: FastAPI, _test_client: TestClient
+) -> Generator[TestClient, None, None]:
     """Create a test client with mocked database for unit tests."""
-
-    def override_get_db():
-        try:
-            yield mock_db
-        finally:
-            pass
-
-    app = create_app()
-    # Override the database dependency with our mock
-    app.dependency_overrides[get_db] = override_get_db
-
-    with TestClient(app) as test_client:
-        yield test_client
+    # Serve the database dependency from our mock
+    app_instance.state.test_db = mock_db
+
+    try:
+        yield _test_client
+    finally:
+        app_instance.state.test_db = None
+        _test_client.headers.pop("Authorization", None)
+        _test_client.cookies.clear()
 
 
 @pytest.fixture
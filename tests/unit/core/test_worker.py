@@ -17,14 +17,26 @@ def test_create_celery_app():
     assert app.main == "worker"
     assert app.conf.broker_url == settings.CELERY_BROKER_URL
     assert app.conf.result_backend == settings.CELERY_RESULT_BACKEND
-    assert app.conf.task_serializer == "json"
-    assert app.conf.accept_content == ["json"]
-    assert app.conf.result_serializer == "json"
+    assert app.conf.task_serializer == "msgpack"
+    assert app.conf.accept_content == ["msgpack", "json"]
+    assert app.conf.result_serializer == "msgpack"
     assert app.conf.timezone == "UTC"
     assert app.conf.enable_utc is True
     assert app.conf.task_track_started is True
     assert app.conf.task_time_limit == 30 * 60  # 30 minutes
     assert app.conf.task_soft_time_limit == 25 * 60  # 25 minutes
+    assert app.conf.task_routes is None
+
+
+def test_create_celery_app_dedicated_queues():
+    """Test that dedicated queue routing is applied only when enabled."""
+    with patch.object(settings, "CELERY_DEDICATED_QUEUES", True):
+        app = create_celery_app()
+
+    assert app.conf.task_routes == {
+        "convert_image_to_pdf": {"queue": "convert"},
+        "merge_pdfs": {"queue": "merge"},
+    }
 
 
 def test_celery_app_instance():
@@ -70,3 +82,18 @@ def test_configure_celery_logging(mock_setup_logging, mock_connect):
         with patch("app.worker.setup_app_logging") as mock_logging:
             signal_handler()
             mock_logging.assert_called_once()
+
+
+@patch("app.worker.get_engine")
+def test_reset_db_pool(mock_get_engine):
+    """Test that worker processes drop the connections inherited on fork."""
+    from app.worker import (  # pylint: disable=import-outside-toplevel
+        create_celery_app, reset_db_pool)
+
+    reset_db_pool()
+    mock_get_engine.return_value.dispose.assert_called_once_with(close=False)
+
+    with patch("app.worker.worker_process_init.connect") as mock_connect_fn:
+        create_celery_app()
+
+        mock_connect_fn.assert_called_once_with(reset_db_pool, weak=False)
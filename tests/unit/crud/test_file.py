@@ -88,6 +88,26 @@ class TestCRUDFile:
         # Assert
         assert result is None
 
+    def test_get_paths_by_ids(
+        self, mock_db: MagicMock, crud_file: CRUDFile, test_file: FileModel
+    ):
+        """Test getting the paths of several files with a single query."""
+        # Arrange
+        row = (test_file.id, test_file.filepath, test_file.owner_id)
+        mock_db.query.return_value.filter.return_value.all.return_value = [row]
+
+        # Act
+        result = crud_file.get_paths_by_ids(mock_db, ids=[1, 2])
+
+        # Assert
+        assert result == [row]
+        # Only the needed columns are selected, not whole File entities
+        mock_db.query.assert_called_once_with(
+            FileModel.id, FileModel.filepath, FileModel.owner_id
+        )
+        mock_db.query.return_value.filter.assert_called_once()
+        mock_db.query.return_value.filter.return_value.all.assert_called_once()
+
     def test_get_multi_by_owner(
         self, mock_db: MagicMock, crud_file: CRUDFile, test_file: FileModel
     ):
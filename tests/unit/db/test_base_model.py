@@ -3,8 +3,10 @@
 from datetime import datetime, timezone
 from unittest.mock import patch
 
+import pytest
 from sqlalchemy import Column, Integer, String, create_engine, inspect
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.db.base import Base
 
@@ -13,11 +15,41 @@ class TestModel(Base):
     """Test model that inherits from our Base class."""
 
     __tablename__ = "test_models"  # Explicit table name to avoid confusion
+    # Tolerate the module being imported twice under importlib mode
+    __table_args__ = {"extend_existing": True}
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
 
 
+@pytest.fixture(scope="module")
+def module_engine():
+    """Create one in-memory database with the schema for this module."""
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def module_session(module_engine):
+    """Provide a session whose changes are rolled back after each test."""
+    connection = module_engine.connect()
+    transaction = connection.begin()
+    session = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )()
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
 def test_base_model_table_name():
     """Test that __tablename__ is properly set."""
     assert (
@@ -25,68 +57,48 @@ def test_base_model_table_name():
     )  # Should match the explicit table name
 
 
-def test_base_model_created_at():
+def test_base_model_created_at(module_session):
     """Test that created_at is automatically set on model creation."""
-    # Create a test engine and session
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
     # Test with current time
     with patch("app.db.base.datetime") as mock_datetime:
         test_time = datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
         mock_datetime.now.return_value = test_time
 
         # Create a test model
-        with SessionLocal() as db:
-            test_model = TestModel(name="test")
-            db.add(test_model)
-            db.commit()
-            db.refresh(test_model)
+        test_model = TestModel(name="test")
+        module_session.add(test_model)
+        module_session.commit()
+        module_session.refresh(test_model)
 
-            # Verify created_at was set correctly (compare naive datetime)
-            # SQLite doesn't store timezone info, so we just check the values match
-            assert test_model.created_at == test_time.replace(tzinfo=None)
-            assert test_model.created_at is not None
+        # Verify created_at was set correctly (compare naive datetime)
+        # SQLite doesn't store timezone info, so we just check the values match
+        assert test_model.created_at == test_time.replace(tzinfo=None)
+        assert test_model.created_at is not None
 
 
-def test_base_model_created_at_preserved():
+def test_base_model_created_at_preserved(module_session):
     """Test that explicitly set created_at is preserved."""
-    # Create a test engine and session
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
     # Create with explicit created_at
     custom_time = datetime(2022, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
-    with SessionLocal() as db:
-        test_model = TestModel(name="test", created_at=custom_time)
-        db.add(test_model)
-        db.commit()
-        db.refresh(test_model)
+    test_model = TestModel(name="test", created_at=custom_time)
+    module_session.add(test_model)
+    module_session.commit()
+    module_session.refresh(test_model)
 
-        # Verify the custom time was preserved (compare naive datetime)
-        assert test_model.created_at == custom_time.replace(tzinfo=None)
+    # Verify the custom time was preserved (compare naive datetime)
+    assert test_model.created_at == custom_time.replace(tzinfo=None)
 
 
-def test_base_model_created_at_not_nullable():
+def test_base_model_created_at_not_nullable(module_engine):
     """Test that created_at cannot be set to None."""
-    # Create a test engine and session
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-    # Try to create with created_at=None
-    with SessionLocal() as db:
-        test_model = TestModel(name="test")
-        # SQLite doesn't enforce NOT NULL constraints by default in some cases
-        # So we'll test the column definition instead
-        inspector = inspect(engine)
-        columns = {
-            col["name"]: col for col in inspector.get_columns("test_models")
-        }
-        assert "created_at" in columns
-        assert not columns["created_at"]["nullable"]
+    # SQLite doesn't enforce NOT NULL constraints by default in some cases
+    # So we'll test the column definition instead
+    inspector = inspect(module_engine)
+    columns = {
+        col["name"]: col for col in inspector.get_columns("test_models")
+    }
+    assert "created_at" in columns
+    assert not columns["created_at"]["nullable"]
 
 
 def test_base_model_inheritance():
@@ -0,0 +1,18 @@
+"""Tests for the database session helpers."""
+
+import sqlite3
+
+from app.db.session import _set_sqlite_pragmas
+
+
+def test_set_sqlite_pragmas(tmp_path):
+    """Test that SQLite connections switch to WAL with NORMAL sync."""
+    conn = sqlite3.connect(tmp_path / "test.db")
+    try:
+        _set_sqlite_pragmas(conn, None)
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # 1 == NORMAL
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    finally:
+        conn.close()
@@ -12,8 +12,8 @@ from app.models.user import User
 def test_user_creation(db_session):
     """Test creating a new user."""
     user = User(
-        email="test@example.com",
-        username="testuser",
+        email="new_user@example.com",
+        username="new_user",
         hashed_password=get_password_hash("testpassword"),
         is_active=True,
         is_superuser=False,
@@ -23,8 +23,8 @@ def test_user_creation(db_session):
     db_session.refresh(user)
 
     assert user.id is not None
-    assert user.email == "test@example.com"
-    assert user.username == "testuser"
+    assert user.email == "new_user@example.com"
+    assert user.username == "new_user"
     assert user.is_active is True
     assert user.is_superuser is False
     assert isinstance(user.created_at, datetime)
@@ -1,5 +1,6 @@
 """Tests for the PDF service module."""
 
+import io
 import os
 import shutil
 from pathlib import Path
@@ -12,6 +13,7 @@ from sqlalchemy.orm import Session
 
 import img2pdf
 from app.models.file import File
+from app.schemas.file import FileCreate
 
 
 @pytest.fixture
@@ -149,9 +151,10 @@ class TestPDFService:
         )
         return file
 
+    @patch("app.services.pdf_service.os.replace")
     @patch("app.services.pdf_service.os.makedirs")
     @patch("pathlib.Path.exists", return_value=False)
-    @patch("app.services.pdf_service.crud.file.create")
+    @patch("app.services.pdf_service.PDFService._insert_file")
     @patch("img2pdf.convert")
     @patch("builtins.open", new_callable=MagicMock)
     @patch("app.services.pdf_service.File")
@@ -160,9 +163,10 @@ class TestPDFService:
         mock_file_model,
         mock_open,
         mock_convert,
-        mock_crud_create,
+        mock_insert_file,
         mock_exists,
         mock_makedirs,
+        mock_replace,
         mock_db,
         mock_file,
     ):
@@ -179,17 +183,13 @@ class TestPDFService:
         query_mock.filter.return_value = filter_mock
         mock_db.query.return_value = query_mock
 
-        # Mock the PDF content
-        pdf_content = b"%PDF-1.4 test pdf content"
-        mock_convert.return_value = pdf_content
-
         # Mock the created file
         created_file = MagicMock()
         created_file.id = 2
         created_file.filename = "test.pdf"
         created_file.content_type = "application/pdf"
         created_file.owner_id = owner_id
-        mock_crud_create.return_value = created_file
+        mock_insert_file.return_value = created_file
 
         # Mock file handles
         mock_file_handle = MagicMock()
@@ -225,10 +225,19 @@ class TestPDFService:
         mock_db.query.assert_called_once_with(mock_file_model)
         query_mock.filter.assert_called_once()
         mock_convert.assert_called_once()
-        mock_crud_create.assert_called_once()
+        mock_insert_file.assert_called_once()
 
-        # Verify the output file was written to
-        mock_output_handle.write.assert_called_once_with(pdf_content)
+        # Verify the PDF was streamed into the partial file and renamed
+        mock_convert.assert_called_once_with(
+            mock_file_handle,
+            outputstream=mock_output_handle,
+            engine=img2pdf.Engine.internal,
+        )
+        partial_path, output_path = mock_replace.call_args.args
+        assert partial_path == f"{output_path}.partial"
+        mock_makedirs.assert_called_once_with(
+            os.path.dirname(output_path), exist_ok=True
+        )
 
     def test_convert_image_to_pdf_file_not_found(self, mock_db):
         """Test image to PDF conversion with non-existent file."""
@@ -297,12 +306,16 @@ class TestPDFService:
         assert "Invalid image" in str(exc_info.value)
 
         # Verify no database operations were performed
-        mock_db.add.assert_not_called()
+        mock_db.execute.assert_not_called()
         mock_db.commit.assert_not_called()
         mock_db.refresh.assert_not_called()
 
-        # Verify file operations
-        mock_file_handle.read.assert_called_once()
+        # Verify the open image file was handed to img2pdf
+        mock_convert.assert_called_once_with(
+            mock_file_handle,
+            outputstream=mock_output_handle,
+            engine=img2pdf.Engine.internal,
+        )
         mock_output_handle.write.assert_not_called()
 
         mock_db.refresh.assert_not_called()
@@ -354,14 +367,6 @@ class TestPDFService:
             1  # This should match the owner_id passed to merge_pdfs
         )
 
-        # Mock the crud.file.get method to return our mock files
-        def mock_file_get(db, id):
-            if id == 1:
-                return mock_file1
-            elif id == 2:
-                return mock_file2
-            return None
-
         # Setup mock settings
         output_dir = test_dir / "output"
         output_dir.mkdir()
@@ -370,25 +375,22 @@ class TestPDFService:
         # Set the temp directory for the PDFService instance
         self.pdf_service.temp_dir = output_dir
 
-        # Mock the database add to return our test file
         # The actual output path is determined by merge_pdfs and stored in result.filepath
-        # We'll capture this in the test and update our mock to return it
+        # We'll capture it when the file record is inserted
         actual_output_path = None
 
-        def mock_add(file):
+        def mock_insert(db, file_data):
             nonlocal actual_output_path
-            file.id = 3
-            # The actual filepath will be set by merge_pdfs
-            # We'll store it when it's set
-            if hasattr(file, "filepath") and file.filepath:
-                actual_output_path = file.filepath
-            return file
-
-        mock_db.add.side_effect = mock_add
+            actual_output_path = file_data.filepath
+            return File(id=3, **file_data.model_dump())
 
-        # Patch the crud.file.get method and run the test
+        # Return the rows out of order; merge_pdfs must restore the
+        # requested one
         with patch(
-            "app.services.pdf_service.crud.file.get", side_effect=mock_file_get
+            "app.services.pdf_service.crud.file.get_paths_by_ids",
+            return_value=[mock_file2, mock_file1],
+        ), patch.object(
+            self.pdf_service, "_insert_file", side_effect=mock_insert
         ):
             # Test using the PDFService instance
             result = self.pdf_service.merge_pdfs(
@@ -426,15 +428,13 @@ class TestPDFService:
     def test_merge_pdfs_file_not_found(self, mock_db, mock_pdf_file):
         """Test merging with non-existent file raises error."""
 
-        # Setup - mock the crud.file.get method to return None for non-existent files
-        def mock_file_get(db, id):
-            if id == 1:
-                return mock_pdf_file
-            return None  # Simulate file not found
+        # Setup - only the existing file is returned by the lookup
+        mock_pdf_file.id = 1
 
         # Test & Verify
         with patch(
-            "app.services.pdf_service.crud.file.get", side_effect=mock_file_get
+            "app.services.pdf_service.crud.file.get_paths_by_ids",
+            return_value=[mock_pdf_file],
         ):
             with pytest.raises(ValueError) as exc_info:
                 self.pdf_service.merge_pdfs(mock_db, [1, 999], "output.pdf", 1)
@@ -451,6 +451,107 @@ class TestPDFService:
         # Check the error message
         assert "No files provided to merge" in str(exc_info.value)
 
+    def test_downscale_jpeg(self):
+        """Test oversized JPEGs are shrunk to fit A4 at 300 DPI."""
+        buf = io.BytesIO()
+        Image.new("RGB", (5000, 4000), color="red").save(buf, "JPEG")
+
+        buf.seek(0)
+
+        result = self.pdf_service._downscale_jpeg(buf)
+
+        with Image.open(io.BytesIO(result)) as im:
+            assert im.format == "JPEG"
+            assert im.width <= 3508 and im.height <= 2480
+
+    def test_downscale_jpeg_keeps_orientation_and_profile(self):
+        """Test downscaling keeps the EXIF orientation and ICC profile."""
+        from PIL import ImageCms
+
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+        icc_profile = ImageCms.ImageCmsProfile(
+            ImageCms.createProfile("sRGB")
+        ).tobytes()
+        buf = io.BytesIO()
+        Image.new("RGB", (6000, 3000), color="red").save(
+            buf, "JPEG", exif=exif.tobytes(), icc_profile=icc_profile
+        )
+        buf.seek(0)
+
+        result = self.pdf_service._downscale_jpeg(buf)
+
+        with Image.open(io.BytesIO(result)) as im:
+            assert im.width <= 3508 and im.height <= 2480
+            assert im.getexif()[0x0112] == 6
+            assert im.info["icc_profile"] == icc_profile
+        # img2pdf still turns the orientation into a page rotation
+        assert b"/Rotate 90" in img2pdf.convert(result)
+
+    def test_downscale_jpeg_small_image_untouched(self):
+        """Test JPEGs that already fit are returned as-is."""
+        buf = io.BytesIO()
+        Image.new("RGB", (100, 100), color="red").save(buf, "JPEG")
+        image_data = buf.getvalue()
+        buf.seek(0)
+
+        result = self.pdf_service._downscale_jpeg(buf)
+
+        # The same stream comes back, rewound for img2pdf to read
+        assert result is buf
+        assert result.read() == image_data
+
+    def test_merge_pdfs_single_file_copies_bytes(self, mock_db):
+        """Test merging a single PDF copies it without re-serializing."""
+        source = MagicMock()
+        source.id = 1
+        source.filepath = str(self.test_pdf)
+        source.owner_id = 1
+
+        with patch(
+            "app.services.pdf_service.crud.file.get_paths_by_ids",
+            return_value=[source],
+        ), patch(
+            "app.services.pdf_service.pikepdf"
+        ) as mock_pikepdf, patch.object(
+            self.pdf_service,
+            "_insert_file",
+            side_effect=lambda db, data: File(id=3, **data.model_dump()),
+        ) as mock_insert_file:
+            result = self.pdf_service.merge_pdfs(mock_db, [1], "single.pdf", 1)
+
+        # The PDF machinery is never touched for a single input
+        mock_pikepdf.Pdf.open.assert_not_called()
+        assert Path(result.filepath).read_bytes() == self.test_pdf.read_bytes()
+        mock_insert_file.assert_called_once()
+        # The copy is renamed into place, no partial file is left behind
+        assert not list(Path(result.filepath).parent.glob("*.partial"))
+
+    def test_insert_file_uses_returning(self, mock_db):
+        """Test the file record is inserted and committed without a refresh."""
+        file_data = FileCreate(
+            filename="merged.pdf",
+            filepath="/path/to/merged.pdf",
+            content_type="application/pdf",
+            owner_id=1,
+        )
+
+        row = mock_db.execute.return_value.one.return_value
+
+        result = self.pdf_service._insert_file(mock_db, file_data)
+
+        # The RETURNING row is handed back as-is, no ORM object is built
+        assert result is row
+        statement = mock_db.execute.call_args.args[0]
+        assert statement.table.name == "files"
+        assert [col.name for col in statement._returning] == [
+            "id",
+            "filepath",
+        ]
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+        mock_db.add.assert_not_called()
+
     @patch("builtins.open", new_callable=MagicMock)
     @patch("img2pdf.convert")
     def test_convert_image_to_pdf_image_open_error(
@@ -476,7 +577,7 @@ class TestPDFService:
         assert "Invalid image format" in str(exc_info.value)
 
         # Verify no database operations were performed
-        mock_db.add.assert_not_called()
+        mock_db.execute.assert_not_called()
         mock_db.commit.assert_not_called()
         mock_db.refresh.assert_not_called()
 
@@ -511,78 +612,30 @@ class TestPDFService:
         assert "File operation error: Disk full" in caplog.text
 
         # Verify no database operations were performed
-        mock_db.add.assert_not_called()
+        mock_db.execute.assert_not_called()
         mock_db.commit.assert_not_called()
         mock_db.refresh.assert_not_called()
 
-    @patch("builtins.open", new_callable=MagicMock)
-    @patch("pypdf.PdfReader")
-    def test_merge_pdfs_invalid_pdf(
-        self, mock_reader_class, mock_open, mock_db, mock_pdf_file
-    ):
+    def test_merge_pdfs_invalid_pdf(self, mock_db):
         """Test merging with invalid PDF raises error."""
-        # Create a second mock PDF file with the same owner
+        # First file is a valid PDF, the second one is garbage
+        invalid_pdf = self.test_dir / "invalid.pdf"
+        invalid_pdf.write_bytes(b"this is not a PDF")
+
+        mock_pdf_file_1 = MagicMock()
+        mock_pdf_file_1.id = 1
+        mock_pdf_file_1.filepath = str(self.test_pdf)
+        mock_pdf_file_1.owner_id = 1
+
         mock_pdf_file_2 = MagicMock()
         mock_pdf_file_2.id = 2
-        mock_pdf_file_2.filename = "test2.pdf"
-        mock_pdf_file_2.filepath = "/path/to/test2.pdf"
-        mock_pdf_file_2.content_type = "application/pdf"
+        mock_pdf_file_2.filepath = str(invalid_pdf)
         mock_pdf_file_2.owner_id = 1  # Same owner as the first file
 
-        # Setup mock for crud.file.get
-        def mock_file_get(db, id):
-            if id == 1:
-                return mock_pdf_file
-            elif id == 2:
-                return mock_pdf_file_2
-            return None
-
-        # Setup mock_open to provide file content
-        def open_side_effect(filename, mode="rb"):
-            if "output" in str(filename):
-                output_file = MagicMock()
-                output_file.__enter__.return_value = output_file
-                return output_file
-
-            # For input files
-            if not hasattr(open_side_effect, "call_count"):
-                open_side_effect.call_count = 0
-
-            open_side_effect.call_count += 1
-
-            if open_side_effect.call_count == 1:
-                # First file is valid
-                mock_file = MagicMock()
-                mock_file.__enter__.return_value = mock_file
-                mock_file.read.return_value = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n3 0 obj<</Type/Page/Parent 2 0 R/Resources<</Font<</F1 4 0 R>>>>/MediaBox[0 0 612 792]/Contents 5 0 R>>endobj\n4 0 obj<</Type/Font/Subtype/Type1/BaseFont/Helvetica>>endobj\n5 0 obj<</Length 44>>stream\nBT/F1 24 Tf 100 700 Td(Test PDF 1)Tj ET\nendstream endobj\nxref\n0 6\n0000000000 65535 f \n0000000009 00000 n \n0000000074 00000 n \n0000000145 00000 n \n0000000221 00000 n \n0000000274 00000 n \ntrailer<</Size 6/Root 1 0 R>>\nstartxref\n400\n%%EOF\n"
-                return mock_file
-            else:
-                # Second file raises error when trying to read it
-                raise Exception("Invalid PDF")
-
-        mock_open.side_effect = open_side_effect
-
-        # Mock PdfReader to raise an error for the second file
-        def pdf_reader_side_effect(*args, **kwargs):
-            if not hasattr(pdf_reader_side_effect, "call_count"):
-                pdf_reader_side_effect.call_count = 0
-
-            pdf_reader_side_effect.call_count += 1
-
-            if pdf_reader_side_effect.call_count == 1:
-                # First file is valid
-                mock_reader = MagicMock()
-                mock_reader.pages = [MagicMock()]
-                return mock_reader
-            else:
-                # Second file raises error
-                raise Exception("Invalid PDF")
-
-        mock_reader_class.side_effect = pdf_reader_side_effect
-
         # Test & Verify
         with patch(
-            "app.services.pdf_service.crud.file.get", side_effect=mock_file_get
+            "app.services.pdf_service.crud.file.get_paths_by_ids",
+            return_value=[mock_pdf_file_1, mock_pdf_file_2],
         ):
             with pytest.raises(ValueError, match="Error reading file 2"):
                 self.pdf_service.merge_pdfs(
@@ -593,10 +646,37 @@ class TestPDFService:
                 )
 
         # Verify no database operations were performed
-        mock_db.add.assert_not_called()
+        mock_db.execute.assert_not_called()
+
+    def test_merge_pdfs_invalid_pdf_closes_opened_inputs(self, mock_db):
+        """Test inputs that did open are closed when another one fails."""
+        files = []
+        for file_id in (1, 2):
+            pdf_file = MagicMock()
+            pdf_file.id = file_id
+            pdf_file.filepath = str(self.test_dir / f"input{file_id}.pdf")
+            pdf_file.owner_id = 1
+            files.append(pdf_file)
+
+        opened = MagicMock()
+
+        def open_side_effect(path):
+            if path == files[0].filepath:
+                raise ValueError("broken xref")
+            return opened
+
+        with patch(
+            "app.services.pdf_service.crud.file.get_paths_by_ids",
+            return_value=files,
+        ), patch("app.services.pdf_service.pikepdf") as mock_pikepdf:
+            mock_pikepdf.Pdf.open.side_effect = open_side_effect
+
+            with pytest.raises(ValueError, match="Error reading file 1"):
+                self.pdf_service.merge_pdfs(mock_db, [1, 2], "output.pdf", 1)
+
+        opened.__exit__.assert_called_once()
+        mock_db.execute.assert_not_called()
 
-    @patch("pypdf.PdfWriter")
-    @patch("pypdf.PdfReader")
     @patch("builtins.open")
     @patch("os.makedirs")
     @patch("os.path.exists", return_value=True)
@@ -607,8 +687,6 @@ class TestPDFService:
         mock_exists,
         mock_makedirs,
         mock_open,
-        mock_reader_class,
-        mock_writer_class,
         mock_db,
         mock_pdf_file,
         caplog,
@@ -638,14 +716,14 @@ class TestPDFService:
         with tempfile.TemporaryDirectory() as temp_dir:
             # Create temporary input files
             input1 = Path(temp_dir) / "input1.pdf"
-            input1.touch()
+            input1.write_bytes(b"%PDF-1.4")
             input2 = Path(temp_dir) / "input2.pdf"
-            input2.touch()
+            input2.write_bytes(b"%PDF-1.4")
 
             # Setup mocks
             with patch("uuid.uuid4", return_value="test-uuid"), patch(
-                "app.services.pdf_service.crud.file.get"
-            ) as mock_get_file, patch(
+                "app.services.pdf_service.crud.file.get_paths_by_ids"
+            ) as mock_get_files, patch(
                 "app.services.pdf_service.crud.file.create"
             ) as mock_create_file, patch(
                 "app.services.pdf_service.settings.UPLOAD_FOLDER",
@@ -670,34 +748,19 @@ class TestPDFService:
                 mock_pdf_file2.filepath = str(input2)
                 mock_pdf_file2.owner_id = owner_id
 
-                def get_file_side_effect(db, id):
-                    if id == 1:
-                        return mock_pdf_file1
-                    elif id == 2:
-                        return mock_pdf_file2
-                    return None
-
-                mock_get_file.side_effect = get_file_side_effect
-
-                # Setup mock for PdfReader that simulates a valid PDF
-                class MockPdfReader:
-                    def __init__(self, *args, **kwargs):
-                        self.pages = [MagicMock()]  # One mock page
-                        self.stream = b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n2 0 obj\n<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n3 0 obj\n<< /Type /Page /Parent 2 0 R /Resources << >> /MediaBox [0 0 612 792] >>\nendobj\nxref\n0 4\n0000000000 65535 f \n0000000010 00000 n \n0000000053 00000 n \n0000000102 00000 n \ntrailer\n<< /Size 4 /Root 1 0 R >>\nstartxref\n149\n%%EOF\n"
-
-                mock_reader_class.side_effect = MockPdfReader
-
-                # Setup mock for PdfWriter with required methods
-                mock_writer = MagicMock()
-                mock_writer.append = MagicMock()
-                mock_writer.write = MagicMock()
-                mock_writer_class.return_value = mock_writer
-
-                # Mock the PdfMerger to avoid actual file operations
-                with patch(
-                    "app.services.pdf_service.PdfWriter",
-                    return_value=mock_writer,
-                ) as mock_merger_class:
+                mock_get_files.return_value = [mock_pdf_file1, mock_pdf_file2]
+
+                # Setup mock for pikepdf so no real parsing happens
+                mock_merged = MagicMock()
+                mock_source = MagicMock()
+                mock_source.pages = [MagicMock()]  # One mock page
+
+                with patch("app.services.pdf_service.pikepdf") as mock_pikepdf:
+                    new_ctx = mock_pikepdf.Pdf.new.return_value
+                    new_ctx.__enter__.return_value = mock_merged
+                    open_ctx = mock_pikepdf.Pdf.open.return_value
+                    open_ctx.__enter__.return_value = mock_source
+
                     # Mock the open function
                     def open_side_effect(filename, mode="rb", **kwargs):
                         filename_str = str(filename)
@@ -749,12 +812,13 @@ class TestPDFService:
                         output_opened
                     ), "Expected to attempt opening output file in write mode"
 
-                    # Verify PdfWriter was called and methods were called as expected
-                    mock_merger_class.assert_called_once()
-                    # Verify append was called for each input file
-                    assert mock_writer.append.call_count == len(file_ids)
-                    # Verify write was not called due to permission error
-                    mock_writer.write.assert_not_called()
+                    # Verify the output document was built as expected
+                    mock_pikepdf.Pdf.new.assert_called_once()
+                    # Verify every input file was opened and its pages copied
+                    assert mock_pikepdf.Pdf.open.call_count == len(file_ids)
+                    assert mock_merged.pages.extend.call_count == len(file_ids)
+                    # Verify save was not called due to permission error
+                    mock_merged.save.assert_not_called()
 
                     # Verify no database operations were performed
                     mock_db.commit.assert_not_called()
@@ -131,11 +131,9 @@ class TestTaskExecutorService:
     def test_execute_with_retry_database_error(
         self, mock_logger, mock_db_session
     ):
-        """Test execute_with_retry with DatabaseError (should retry)."""
+        """Test execute_with_retry with DatabaseError (left to autoretry)."""
         # Setup mocks
         mock_task = MagicMock()
-        # Configure request.retries to return a fixed value
-        mock_task.request.retries = 0
         mock_db = MagicMock()
         mock_db_session.return_value.__enter__.return_value = mock_db
 
@@ -143,45 +141,34 @@ class TestTaskExecutorService:
         def mock_operation(db):
             raise DatabaseError("DB error")
 
-        # Configure retry to raise an exception to simulate Celery's behavior
-        retry_exception = Exception("Retry")
-        mock_task.retry.side_effect = retry_exception
-
-        # Test that retry is called and the exception is propagated
-        with pytest.raises(Exception, match="Retry"):
+        # The error propagates so the task's autoretry can reschedule it
+        with pytest.raises(DatabaseError, match="DB error"):
             TaskExecutorService.execute_with_retry(
                 task_instance=mock_task,
                 operation_name="test_operation",
                 operation_func=mock_operation,
             )
 
-        # Verify retry was called with correct parameters
-        mock_task.retry.assert_called_once()
-        retry_call_args = mock_task.retry.call_args[1]
-        assert retry_call_args["max_retries"] == 3
-        assert retry_call_args["countdown"] == 60  # min(60 * (0 + 1), 300)
+        # Retries are scheduled by Celery, never manually
+        mock_task.retry.assert_not_called()
 
         # Verify logging
         mock_logger.error.assert_called_once()
-        # Check the format string and arguments
         assert (
             mock_logger.error.call_args[0][0]
-            == "Database error during %s (will retry): %s"
+            == "Error during %s (will retry): %s"
         )
         assert mock_logger.error.call_args[0][1] == "test_operation"
-        # The error message should be a string, not the exception object
-        assert "DB error" in mock_logger.error.call_args[0][2]
+        assert "DB error" in str(mock_logger.error.call_args[0][2])
 
     @patch("app.services.task_executor.TaskExecutorService.db_session")
     @patch("app.services.task_executor.logger")
     def test_execute_with_retry_unexpected_error(
         self, mock_logger, mock_db_session
     ):
-        """Test execute_with_retry with unexpected error (should retry)."""
+        """Test execute_with_retry leaves unexpected errors to autoretry."""
         # Setup mocks
         mock_task = MagicMock()
-        # Configure request.retries to return a fixed value
-        mock_task.request.retries = 0
         mock_db = MagicMock()
         mock_db_session.return_value.__enter__.return_value = mock_db
 
@@ -189,76 +176,20 @@ class TestTaskExecutorService:
         def mock_operation(db):
             raise ValueError("Unexpected error")
 
-        # Configure retry to raise an exception to simulate Celery's behavior
-        retry_exception = Exception("Retry")
-        mock_task.retry.side_effect = retry_exception
-
-        # Test that retry is called and the exception is propagated
-        with pytest.raises(Exception, match="Retry"):
+        with pytest.raises(ValueError, match="Unexpected error"):
             TaskExecutorService.execute_with_retry(
                 task_instance=mock_task,
                 operation_name="test_operation",
                 operation_func=mock_operation,
             )
 
-        # Verify retry was called with correct parameters
-        mock_task.retry.assert_called_once()
-        retry_call_args = mock_task.retry.call_args[1]
-        assert retry_call_args["max_retries"] == 3
-        assert retry_call_args["countdown"] == 60  # min(60 * (0 + 1), 300)
+        mock_task.retry.assert_not_called()
 
         # Verify logging
         mock_logger.error.assert_called_once()
-        # Check the format string and arguments separately
         assert (
             mock_logger.error.call_args[0][0]
-            == "Unexpected error during %s (will retry): %s"
+            == "Error during %s (will retry): %s"
         )
         assert mock_logger.error.call_args[0][1] == "test_operation"
         assert "Unexpected error" in str(mock_logger.error.call_args[0][2])
-
-    @patch("app.services.task_executor.TaskExecutorService.db_session")
-    @patch("app.services.task_executor.logger")
-    def test_execute_with_retry_custom_max_retries(
-        self, mock_logger, mock_db_session
-    ):
-        """Test execute_with_retry with custom max_retries parameter."""
-        # Setup mocks
-        mock_task = MagicMock()
-        # Configure request.retries to return a fixed value
-        mock_task.request.retries = 0
-        mock_db = MagicMock()
-        mock_db_session.return_value.__enter__.return_value = mock_db
-
-        # Mock operation that raises an error
-        def mock_operation(db):
-            raise DatabaseError("DB error")
-
-        # Configure retry to raise an exception to simulate Celery's behavior
-        retry_exception = Exception("Retry")
-        mock_task.retry.side_effect = retry_exception
-
-        # Test with custom max_retries
-        with pytest.raises(Exception, match="Retry"):
-            TaskExecutorService.execute_with_retry(
-                task_instance=mock_task,
-                operation_name="test_operation",
-                operation_func=mock_operation,
-                max_retries=5,
-            )
-
-        # Verify custom max_retries was used
-        mock_task.retry.assert_called_once()
-        retry_call_args = mock_task.retry.call_args[1]
-        assert retry_call_args["max_retries"] == 5
-
-        # Verify logging
-        mock_logger.error.assert_called_once()
-        # Check the format string and arguments
-        assert (
-            mock_logger.error.call_args[0][0]
-            == "Database error during %s (will retry): %s"
-        )
-        assert mock_logger.error.call_args[0][1] == "test_operation"
-        # The error message should be a string, not the exception object
-        assert "DB error" in mock_logger.error.call_args[0][2]
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.core.exceptions import ServiceError
 from app.models.file import File
-from app.services.task_service import task_service
+from app.services import task_service
 
 
 class TestTaskService:
@@ -25,8 +25,8 @@ class TestTaskService:
         mock_pdf_service = MagicMock()
         mock_pdf_service.convert_image_to_pdf.return_value = mock_file
 
-        # Patch the pdf_service instance in the task_service module
-        with patch("app.services.task_service.pdf_service", mock_pdf_service):
+        # Patch the pdf_service bound to the task service
+        with patch.object(task_service, "pdf_service", mock_pdf_service):
             # Execute
             result = task_service.convert_image_to_pdf(mock_db, 1, 1)
 
@@ -53,8 +53,8 @@ class TestTaskService:
         )
 
         # Patch the pdf_service instance and mock the logger
-        with patch(
-            "app.services.task_service.pdf_service", mock_pdf_service
+        with patch.object(
+            task_service, "pdf_service", mock_pdf_service
         ), patch("app.services.task_service.logger.error") as mock_logger:
 
             # Execute & Assert
@@ -72,6 +72,20 @@ class TestTaskService:
             assert error_msg in str(mock_logger.call_args[0][1])
             assert mock_logger.call_args[1]["exc_info"] is True
 
+    def test_convert_image_to_pdf_unexpected_error_propagates(self):
+        """Unexpected errors should not be wrapped in ServiceError."""
+        # Setup
+        mock_db = MagicMock(spec=Session)
+        mock_pdf_service = MagicMock()
+        mock_pdf_service.convert_image_to_pdf.side_effect = RuntimeError(
+            "Database unavailable"
+        )
+
+        # Execute & Assert
+        with patch.object(task_service, "pdf_service", mock_pdf_service):
+            with pytest.raises(RuntimeError, match="Database unavailable"):
+                task_service.convert_image_to_pdf(mock_db, 1, 1)
+
     def test_merge_pdfs_success(self):
         """Test successful PDF merging."""
         # Setup
@@ -89,8 +103,8 @@ class TestTaskService:
         mock_pdf_service = MagicMock()
         mock_pdf_service.merge_pdfs.return_value = mock_file
 
-        # Patch the pdf_service instance in the task_service module
-        with patch("app.services.task_service.pdf_service", mock_pdf_service):
+        # Patch the pdf_service bound to the task service
+        with patch.object(task_service, "pdf_service", mock_pdf_service):
             # Execute
             result = task_service.merge_pdfs(
                 mock_db, file_ids, output_filename, owner_id
@@ -122,8 +136,8 @@ class TestTaskService:
         mock_pdf_service.merge_pdfs.side_effect = ValueError(error_msg)
 
         # Patch the pdf_service instance and mock the logger
-        with patch(
-            "app.services.task_service.pdf_service", mock_pdf_service
+        with patch.object(
+            task_service, "pdf_service", mock_pdf_service
         ), patch("app.services.task_service.logger.error") as mock_logger:
 
             # Execute & Assert
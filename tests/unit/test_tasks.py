@@ -1,68 +1,19 @@
 """Unit tests for Celery tasks."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
-from celery.exceptions import Retry
 
 from app.core.exceptions import ServiceError
-from app.tasks import _handle_task_failure, convert_image_to_pdf, merge_pdfs
-
-
-class TestTaskHelpers:
-    """Test helper functions for tasks."""
-
-    def test_handle_task_failure_service_error(self):
-        """Should handle service errors without retrying."""
-        task = MagicMock()
-        task.request.retries = 0
-        task.max_retries = 3
-        exc = ServiceError("Test error")
-
-        result = _handle_task_failure(task, exc, "test_operation")
-
-        assert result["status"] == "error"
-        assert "Test error" in result["error"]
-        assert result["retries"] == 0
-        assert result["max_retries"] == 3
-        task.retry.assert_not_called()
-
-    def test_handle_task_failure_retryable(self):
-        """Should handle retryable errors with backoff."""
-        task = MagicMock()
-        task.request.retries = 1
-        task.max_retries = 3
-        exc = Exception("Temporary failure")
-
-        # Create a proper Retry exception
-        retry_exc = Retry(exc=exc, when=120)
-        task.retry.side_effect = retry_exc
-
-        with pytest.raises(Retry) as exc_info:
-            _handle_task_failure(task, exc, "test_operation")
-
-        assert exc_info.value == retry_exc
-        task.retry.assert_called_once_with(exc=exc, countdown=120)
-
-    def test_handle_task_failure_max_retries(self):
-        """Should handle max retries exceeded."""
-        task = MagicMock()
-        task.request.retries = 3
-        task.max_retries = 3
-        exc = Exception("Permanent failure")
-
-        result = _handle_task_failure(task, exc, "test_operation")
-
-        assert result["status"] == "error"
-        assert "Failed after 3 retries" in result["error"]
-        task.retry.assert_not_called()
+from app.services import task_service
+from app.tasks import convert_image_to_pdf, merge_pdfs
 
 
 class TestConvertImageToPdfTask:
     """Unit tests for convert_image_to_pdf Celery task."""
 
     @patch("app.tasks.TaskExecutorService.execute_with_retry", autospec=True)
-    @patch("app.tasks.task_service.convert_image_to_pdf")
+    @patch("app.tasks._convert_image_to_pdf")
     def test_convert_image_to_pdf_success(self, mock_convert, mock_execute):
         """Task should delegate to TaskExecutorService and return expected result."""
         # Setup
@@ -89,9 +40,25 @@ class TestConvertImageToPdfTask:
         )
         assert call_args["operation_func"] == mock_convert
 
+    @patch("app.tasks.TaskExecutorService.execute_with_retry")
+    def test_convert_image_to_pdf_service_error(self, mock_execute):
+        """Service errors should fail the task without being retried."""
+        # Setup
+        mock_execute.side_effect = ServiceError("Test error")
+
+        # Execute
+        task = convert_image_to_pdf.s(file_id=1, owner_id=10)
+        result = task.apply()
+
+        # Verify
+        assert result.failed()
+        with pytest.raises(ServiceError, match="Test error"):
+            result.get()
+        mock_execute.assert_called_once()
+
     @patch("app.tasks.TaskExecutorService.execute_with_retry")
     def test_convert_image_to_pdf_failure(self, mock_execute):
-        """Task should handle failures gracefully."""
+        """Unexpected errors should be retried by Celery's autoretry."""
         # Setup
         mock_execute.side_effect = Exception("Test error")
 
@@ -100,15 +67,51 @@ class TestConvertImageToPdfTask:
         result = task.apply()
 
         # Verify
-        assert result.get()["status"] == "error"
-        assert "Test error" in result.get()["error"]
+        assert result.failed()
+        with pytest.raises(Exception, match="Test error"):
+            result.get()
+        assert mock_execute.call_count == convert_image_to_pdf.max_retries + 1
+
+    @patch("app.services.task_executor.TaskExecutorService.db_session")
+    def test_convert_image_to_pdf_retries_transient_error(
+        self, mock_db_session
+    ):
+        """Errors escaping the real TaskService should be autoretried."""
+        with patch.object(
+            task_service.pdf_service,
+            "convert_image_to_pdf",
+            side_effect=RuntimeError("Database unavailable"),
+        ) as mock_convert:
+            result = convert_image_to_pdf.s(file_id=1, owner_id=10).apply()
+
+        assert result.failed()
+        with pytest.raises(RuntimeError, match="Database unavailable"):
+            result.get()
+        assert mock_convert.call_count == convert_image_to_pdf.max_retries + 1
+
+    @patch("app.services.task_executor.TaskExecutorService.db_session")
+    def test_convert_image_to_pdf_validation_error_not_retried(
+        self, mock_db_session
+    ):
+        """Validation errors from the real TaskService should fail once."""
+        with patch.object(
+            task_service.pdf_service,
+            "convert_image_to_pdf",
+            side_effect=ValueError("File with id 1 not found"),
+        ) as mock_convert:
+            result = convert_image_to_pdf.s(file_id=1, owner_id=10).apply()
+
+        assert result.failed()
+        with pytest.raises(ServiceError, match="File with id 1 not found"):
+            result.get()
+        mock_convert.assert_called_once()
 
 
 class TestMergePdfsTask:
     """Unit tests for merge_pdfs Celery task."""
 
     @patch("app.tasks.TaskExecutorService.execute_with_retry", autospec=True)
-    @patch("app.tasks.task_service.merge_pdfs")
+    @patch("app.tasks._merge_pdfs")
     def test_merge_pdfs_success(self, mock_merge, mock_execute):
         """Task should delegate to TaskExecutorService and return expected result."""
         # Setup
@@ -151,5 +154,7 @@ class TestMergePdfsTask:
         result = task.apply()
 
         # Verify
-        assert result.get()["status"] == "error"
-        assert "Merge failed" in result.get()["error"]
+        assert result.failed()
+        with pytest.raises(Exception, match="Merge failed"):
+            result.get()
+        assert mock_execute.call_count == merge_pdfs.max_retries + 1